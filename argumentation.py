@@ -1,99 +1,799 @@
 import argparse
 from typing import List, Set, Tuple
-from itertools import combinations, product
+from itertools import combinations
+import profil
+from budget import BudgetDepasse
+from caracteristique import FonctionCaracteristique
+from masques import bits, masque_de
+from sat import enumerer_extensions
 
+#Les trois étiquettes possibles d'un argument
+IN, OUT, UNDEC = "IN", "OUT", "UNDEC"
+#Les sémantiques gérées par le solveur
+SEMANTIQUES = ("CO", "ST", "GR", "PR")
+#Les moteurs de recherche disponibles pour iter_extensions
+MOTEURS = ("etiquetage", "sat", "numpy", "naif")
+#Nombre maximal d'étiquetages de composantes gardés en mémoire
+MEMO_MAX = 100000
+#Ensemble vide partagé pour les arguments absents des index
+_VIDE = frozenset()
+
+#Attaques qui mentionnent un argument non déclaré: l'argumentation est celle des arguments déclarés,
+#une telle attaque ne compte pour aucune sémantique tant que l'argument n'est pas ajouté (add_argument).
+#C'est un choix: la version d'origine, qui testait les paires d'attaques une à une, traitait un
+#attaquant non déclaré comme un attaquant actif pour CO (l'argument attaqué ne pouvait être défendu que
+#si le sous ensemble attaquait cet attaquant) mais l'ignorait pour ST. Les fichiers concernés sont
+#refusés au chargement (voir formats.py): la différence ne touche que les argumentations construites
+#directement ou modifiées avec add_attack.
 class Argumentation:
     #Ici on initialise l'argumentation avec les arguments et les attaques
-    def __init__(self, arguments, attaque):
-        self.arguments = arguments
-        self.attaque = attaque
+    #(etiquettes permet d'imposer l'ordre de numérotation des arguments, triés par défaut)
+    #Les ensembles reçus sont copiés: les modifications (add_attack...) ne touchent pas ceux de l'appelant
+    def __init__(self, arguments, attaque, etiquettes=None):
+        self.arguments = set(arguments)
+        self._attaque = set(attaque)
+        #On construit une seule fois les index des attaquants et des cibles de chaque argument,
+        #les vérifications n'ont alors plus besoin de parcourir toutes les attaques
+        self._attackers_of = {arg: set() for arg in arguments}
+        self._targets_of = {arg: set() for arg in arguments}
+        for attaquant, cible in attaque:
+            self._attackers_of.setdefault(cible, set()).add(attaquant)
+            self._targets_of.setdefault(attaquant, set()).add(cible)
+        #Représentation compacte: chaque argument reçoit un numéro, un sous ensemble devient un entier
+        #dont le bit i vaut 1 si l'argument numéro i en fait partie. Les attaquants et les cibles de
+        #chaque argument sont précalculés sous forme de masques. Les attaques qui mentionnent un
+        #argument non déclaré n'y figurent pas (voir plus haut).
+        self.etiquettes = list(etiquettes) if etiquettes is not None else sorted(arguments)
+        self.ids = {arg: i for i, arg in enumerate(self.etiquettes)}
+        attaquants, cibles = [], []
+        for attaquant, cible in attaque:
+            if attaquant in self.ids and cible in self.ids:
+                attaquants.append(self.ids[attaquant])
+                cibles.append(self.ids[cible])
+        self._masques_depuis(attaquants, cibles)
+        self._hors = None
+
+    #Construction directe depuis une table d'étiquettes et les attaques en numéros de cette table:
+    #attaquants[k] attaque cibles[k] (par exemple deux array("i"), voir formats.py). On évite ainsi les
+    #paires d'étiquettes; les ensembles arguments/attaque et les index attackers_of/targets_of ne sont
+    #construits qu'au premier accès. declares donne les numéros des arguments (tous par défaut), les
+    #arguments sont numérotés dans l'ordre de leurs étiquettes, comme avec le constructeur.
+    @classmethod
+    def depuis_numeros(cls, etiquettes, attaquants, cibles, declares=None):
+        af = cls.__new__(cls)
+        declares = range(len(etiquettes)) if declares is None else sorted(set(declares))
+        af.etiquettes = sorted(etiquettes[i] for i in declares)
+        af.ids = {arg: i for i, arg in enumerate(af.etiquettes)}
+        af.arguments = set(af.etiquettes)
+        rangs = [af.ids.get(etiquette, -1) for etiquette in etiquettes]
+        internes_a, internes_c, af._hors = [], [], []
+        for i, j in zip(attaquants, cibles):
+            if rangs[i] >= 0 and rangs[j] >= 0:
+                internes_a.append(rangs[i])
+                internes_c.append(rangs[j])
+            else:
+                af._hors.append((etiquettes[i], etiquettes[j]))
+        af._masques_depuis(internes_a, internes_c)
+        af._attaque = af._attackers_of = af._targets_of = None
+        return af
+
+    #Masques des attaquants et des cibles à partir des attaques en numéros
+    def _masques_depuis(self, attaquants, cibles):
+        self._tous = (1 << len(self.etiquettes)) - 1
+        #On regroupe d'abord les numéros puis on construit chaque masque une seule fois: ajouter les
+        #bits un par un recopierait tout l'entier à chaque attaque sur les grandes argumentations
+        par_cible = [[] for _ in self.etiquettes]
+        par_attaquant = [[] for _ in self.etiquettes]
+        for i, j in zip(attaquants, cibles):
+            par_cible[j].append(i)
+            par_attaquant[i].append(j)
+        self.masque_attaquants = [masque_de(numeros) for numeros in par_cible]
+        self.masque_cibles = [masque_de(numeros) for numeros in par_attaquant]
+        #Résultats réutilisables: la simplification (refaite après chaque modification) et les
+        #étiquetages de chaque composante fortement connexe, indexés par le contenu de la composante
+        #et le conditionnement de ses entrées pour rester valables quand l'argumentation change
+        self._simplification = None
+        self._memo_composantes = {}
+
+    #Les attaques en paires d'étiquettes et les index, reconstruits depuis les masques au premier accès
+    #pour une argumentation créée par depuis_numeros
+    def _indexer(self):
+        self._attaque = set(self._hors)
+        self._attackers_of = {arg: set() for arg in self.etiquettes}
+        self._targets_of = {arg: set() for arg in self.etiquettes}
+        for j, masque in enumerate(self.masque_attaquants):
+            for i in bits(masque):
+                self._attaque.add((self.etiquettes[i], self.etiquettes[j]))
+        for attaquant, cible in self._attaque:
+            self._attackers_of.setdefault(cible, set()).add(attaquant)
+            self._targets_of.setdefault(attaquant, set()).add(cible)
+
+    @property
+    def attaque(self):
+        if self._attaque is None:
+            self._indexer()
+        return self._attaque
+
+    @property
+    def attackers_of(self):
+        if self._attackers_of is None:
+            self._indexer()
+        return self._attackers_of
+
+    @property
+    def targets_of(self):
+        if self._targets_of is None:
+            self._indexer()
+        return self._targets_of
+
+    #Nombre d'attaques, sans construire les paires d'étiquettes si elles ne le sont pas encore
+    def _nombre_attaques(self):
+        if self._attaque is not None:
+            return len(self._attaque)
+        return sum(masque.bit_count() for masque in self.masque_attaquants) + len(self._hors)
+
+    #Modifications incrémentales: les index et les masques sont mis à jour sur place, seuls les
+    #voisins de l'argument ou de l'attaque touchés sont concernés. Les étiquetages déjà calculés des
+    #composantes que la modification n'atteint pas restent en mémoire et sont réutilisés.
+    #La simplification, elle, est oubliée et refaite entièrement à la requête suivante, en
+    #O(arguments + attaques): après une modification, la première requête coûte au moins ce parcours.
+    def add_argument(self, arg):
+        if arg in self.arguments:
+            return
+        self.arguments.add(arg)
+        self.attackers_of.setdefault(arg, set())
+        self.targets_of.setdefault(arg, set())
+        self.ids[arg] = len(self.etiquettes)
+        self.etiquettes.append(arg)
+        self.masque_attaquants.append(self._vers_masque(self.attackers_of[arg]))
+        self.masque_cibles.append(self._vers_masque(self.targets_of[arg]))
+        bit = 1 << self.ids[arg]
+        for i in bits(self.masque_attaquants[-1]):
+            self.masque_cibles[i] |= bit
+        for i in bits(self.masque_cibles[-1]):
+            self.masque_attaquants[i] |= bit
+        self._tous |= bit
+        self._simplification = None
+
+    #Le numéro de l'argument retiré est repris par le dernier argument, il n'y a donc pas de trou
+    def remove_argument(self, arg):
+        if arg not in self.arguments:
+            return
+        for attaquant in list(self.attackers_of.get(arg, _VIDE)):
+            self.remove_attack(attaquant, arg)
+        for cible in list(self.targets_of.get(arg, _VIDE)):
+            self.remove_attack(arg, cible)
+        self.arguments.discard(arg)
+        del self.attackers_of[arg], self.targets_of[arg]
+        i, dernier = self.ids.pop(arg), len(self.etiquettes) - 1
+        if i != dernier:
+            #Le dernier argument prend le numéro i: on déplace son bit chez ses voisins
+            deplace = self.etiquettes[dernier]
+            ancien, nouveau = 1 << dernier, 1 << i
+            attaquants, cibles = self.masque_attaquants[dernier], self.masque_cibles[dernier]
+            for j in bits(attaquants):
+                self.masque_cibles[j] = self.masque_cibles[j] & ~ancien | nouveau
+            for j in bits(cibles):
+                self.masque_attaquants[j] = self.masque_attaquants[j] & ~ancien | nouveau
+            self.masque_attaquants[i] = self.masque_attaquants[dernier]
+            self.masque_cibles[i] = self.masque_cibles[dernier]
+            self.etiquettes[i] = deplace
+            self.ids[deplace] = i
+        self.etiquettes.pop()
+        self.masque_attaquants.pop()
+        self.masque_cibles.pop()
+        self._tous >>= 1
+        self._simplification = None
+
+    def add_attack(self, attaquant, cible):
+        if (attaquant, cible) in self.attaque:
+            return
+        self.attaque.add((attaquant, cible))
+        self.attackers_of.setdefault(cible, set()).add(attaquant)
+        self.targets_of.setdefault(attaquant, set()).add(cible)
+        if attaquant in self.ids and cible in self.ids:
+            self.masque_attaquants[self.ids[cible]] |= 1 << self.ids[attaquant]
+            self.masque_cibles[self.ids[attaquant]] |= 1 << self.ids[cible]
+        self._simplification = None
+
+    def remove_attack(self, attaquant, cible):
+        if (attaquant, cible) not in self.attaque:
+            return
+        self.attaque.discard((attaquant, cible))
+        self.attackers_of[cible].discard(attaquant)
+        self.targets_of[attaquant].discard(cible)
+        #Un argument non déclaré ne reste dans les index que tant qu'une attaque le mentionne
+        if cible not in self.arguments and not self.attackers_of[cible]:
+            del self.attackers_of[cible]
+        if attaquant not in self.arguments and not self.targets_of[attaquant]:
+            del self.targets_of[attaquant]
+        if attaquant in self.ids and cible in self.ids:
+            self.masque_attaquants[self.ids[cible]] &= ~(1 << self.ids[attaquant])
+            self.masque_cibles[self.ids[attaquant]] &= ~(1 << self.ids[cible])
+        self._simplification = None
 
     #Cette fonction permet de parser le fichier avec les arguments et les attaquants et cibles et les mettre dans
-    #dans un résolveur d'argumentation
-    def fichier_vers_arg(chemin):
-        #On crée les ensembles de base du solveur d'argumentation
-        arguments = set()
-        attaquants = set()
-        #On lit le fichier:
-        with open(chemin, 'r') as fichier:
-            for ligne in fichier:
-                ligne = ligne.strip()
-                #Si la ligne contient un argument par exemple arg(A). et bien l'on va ajouter A
-                # à l'ensemble des arguments: arg( pour le 4 et ). pour le -2
-                if ligne.startswith("arg("):
-                    arguments.add(ligne[4:-2])
-                #Sinon, il s'agit d'une attaque par exemple att(A,B)., avec ligne
-                # [4:-2] on a A,B et on split , du coup on a : A B qui sont les attaquants et cibles
-                #et on les ajoute dans les attaques
-                elif ligne.startswith("att("):
-                    attaquant, cible = ligne[4:-2].split(',')
-                    attaquants.add((attaquant.strip(), cible.strip()))
-        #Enfin on retourne l'argumentation avec les arguments et les attaquants
-        return Argumentation(arguments, attaquants)
-
-  
+    #dans un résolveur d'argumentation. La lecture est faite par formats.py, qui accepte aussi les
+    #formats TGF et i23 de l'ICCMA et signale les lignes mal formées.
+    def fichier_vers_arg(chemin, format=None):
+        from formats import charger
+        return charger(chemin, format)
+
+    #Ces deux fonctions passent d'un ensemble d'étiquettes à son masque et inversement
+    #(les étiquettes inconnues sont ignorées)
+    def _vers_masque(self, sousens):
+        masque = 0
+        for arg in sousens:
+            if arg in self.ids:
+                masque |= 1 << self.ids[arg]
+        return masque
+
+    def _vers_ensemble(self, masque):
+        return {self.etiquettes[i] for i in bits(masque)}
+
+    #Cette fonction renvoie le masque de tous les arguments attaqués par un sous ensemble
+    def _attaques_par(self, masque):
+        attaques = 0
+        for i in bits(masque):
+            attaques |= self.masque_cibles[i]
+        return attaques
+
     #Cette fonction s'occupe de vérifier si un sous ensemble est sans conflit
     def est_sans_conflit(self, sousens):
-    #Vérifier s'il existe une attaque dans les paires générées
-        return not any(map(lambda s: s in self.attaque, product(sousens, sousens)))
+    #Vérifier qu'aucun argument du sous ensemble n'attaque un argument du sous ensemble
+        masque = self._vers_masque(sousens)
+        return not self._attaques_par(masque) & masque
         # {"a", "b", "c", "d", "e"},{("a", "b"),("b", "c"),("c", "d"),("d", "e")} 
-        # sousens = {"a", "c"}
-        # product(sousens, sousens) = [('a', 'a'), ('a', 'c'), ('c', 'a'), ('c', 'c')]
+        # sousens = {"a", "c"} -> masque 0b00101
+        # cibles de a et c: {"b", "d"} -> 0b01010, et 0b01010 & 0b00101 = 0: pas de conflit
     
     #Cette fonction permet de savoir si un sous ensemble défend un arugment
     def defends(self, arg, sousens): 
-        for attaquant, cible in self.attaque:
-            #On va chercher donc dans les attaques si l'argument est la cible d'une attaque
-            if cible == arg:
-                #Si oui, on cherche s'il existe un défenseur à la cible
-                #Si elle n'existe pas on renvoie False
-                if not any((defenseur, attaquant) in self.attaque for defenseur in sousens):
-                    return False
-        #Sinon True
-        return True
+        if arg not in self.ids:
+            return True
+        #Il faut que tous les attaquants de l'argument soient attaqués par le sous ensemble
+        attaques = self._attaques_par(self._vers_masque(sousens))
+        return not self.masque_attaquants[self.ids[arg]] & ~attaques
 
     #Cette fonction verifie si un sous ensemble est admissible
     def est_admissible(self, sousens):
        #Pour être admissible il faut qu'il n'y ait pas de conflits et qu'il
-       # ne doit pas exister un argument dans sousens qui n'est pas défendu
-       return self.est_sans_conflit(sousens) and not any(not self.defends(arg, self.arguments) for arg in sousens)
+       # ne doit pas exister un argument dans sousens qui n'est pas défendu par sousens
+       #S ⊆ F(S) avec la fonction caractéristique, calculée en une passe (voir caracteristique.py)
+       return self._caracteristique(sousens).admissible()
+
+    def _caracteristique(self, sousens):
+        return FonctionCaracteristique(self.masque_attaquants, self.masque_cibles, self._vers_masque(sousens))
     
     #Cette fonction renvoie les extensions complètes d'une argumentation
-    def extensions_complete(self):
-        extensions = []
-        #Pour chaque sous ensemble de l'argumentation, on va vérifier comme dans le cours:
-        for sousens in self.multi_ensemble():
-            #Premièrement s'il est admissible:
-            if self.est_admissible(sousens):
-                #et deuxièmement s'il contient tous les arguments qu'il défend
-                defendu = set(arg for arg in self.arguments if self.defends(arg, sousens))
-                if sousens == defendu:
-                    #Si ces deux conditions passent on ajoute le sous ensemble aux extensions et ainsi de suite
-                    extensions.append(sousens)
-        return extensions
+    def extensions_complete(self, budget=None):
+        return self._lister("CO", budget)
 
     #Cette fonction renvoie les extensions stables d'une argumentation
-    def extensions_stable(self):
-        extensions = []
-        #Pour chaque sous ensemble de l'argumentation, on va vérifier comme dans le cours:
-        for sousens in self.multi_ensemble():
-            #Premièrement, on vérifie s'il est sans conflit
-            if self.est_sans_conflit(sousens):
-                # Deuxièmement, on cherche les arguments attaqués par le sous-ensemble
-                attaques = {cible for attaquant, cible in self.attaque if attaquant in sousens}
-                # Et enfin on vérifie si tout argument qui n'est pas dans sousens est attaqué
-                if all(arg in attaques  for arg in self.arguments - sousens):
-                    extensions.append(sousens)
-        return extensions
-
-
-    #Cette fonction revoie toutes les combinaisons de sous ensemble de l'argumentation
-    #Elle est nécessaire pour la recherche d'extensions stables et complètes
+    def extensions_stable(self, budget=None):
+        return self._lister("ST", budget)
+
+    #Liste des extensions d'une sémantique. Si le budget est dépassé, l'exception BudgetDepasse
+    #emporte les extensions déjà trouvées (attribut partiel)
+    def _lister(self, semantique, budget=None):
+        trouvees = []
+        try:
+            for extension in self.iter_extensions(semantique, budget=budget):
+                trouvees.append(extension)
+        except BudgetDepasse as depassement:
+            depassement.partiel = trouvees
+            raise
+        return trouvees
+
+    #Cette fonction renvoie l'extension fondée (grounded): le plus petit point fixe de la fonction
+    #caractéristique, c'est à dire la plus petite extension complète
+    def extension_grounded(self):
+        return self._vers_ensemble(self._grounded()[0])
+
+    #Calcul de l'extension fondée en temps proportionnel au nombre d'attaques: on part des arguments
+    #non attaqués (IN), leurs cibles deviennent OUT, et un argument dont tous les attaquants sont OUT
+    #entre à son tour dans la file. Renvoie les masques (IN, OUT), le reste est UNDEC.
+    def _grounded(self):
+        restants = [attaquants.bit_count() for attaquants in self.masque_attaquants]
+        file = [i for i, nombre in enumerate(restants) if nombre == 0]
+        m_in = m_out = 0
+        while file:
+            i = file.pop()
+            m_in |= 1 << i
+            for cible in bits(self.masque_cibles[i] & ~m_out):
+                m_out |= 1 << cible
+                for suivant in bits(self.masque_cibles[cible]):
+                    restants[suivant] -= 1
+                    if restants[suivant] == 0 and not m_out >> suivant & 1:
+                        file.append(suivant)
+        return m_in, m_out
+
+    #Simplification de l'argumentation avant toute recherche: les arguments non attaqués sont IN dans
+    #toutes les extensions complètes et stables, leurs cibles sont OUT, et ainsi de suite jusqu'à
+    #l'extension fondée. Seuls les arguments restés indécis forment le noyau qu'il faut explorer,
+    #les attaques venant d'arguments OUT n'y jouent plus aucun rôle.
+    #Renvoie (noyau, fixes, rapport): les extensions de l'argumentation sont exactement les
+    #fixes | e pour e extension du noyau. Le noyau est self si rien ne peut être retiré.
+    def simplify(self):
+        if self._simplification is None:
+            self._simplification = self._simplifier()
+        return self._simplification
+
+    def _simplifier(self):
+        g_in, g_out = self._grounded()
+        indecis = self._tous & ~(g_in | g_out)
+        auto_attaquants = sum(1 for i in bits(indecis) if self.masque_attaquants[i] >> i & 1)
+        if not g_in | g_out:
+            noyau = self
+        else:
+            #Le noyau est construit directement depuis les masques restreints aux arguments indécis
+            attaquants, cibles = [], []
+            for j in bits(indecis):
+                for i in bits(self.masque_attaquants[j] & indecis):
+                    attaquants.append(i)
+                    cibles.append(j)
+            noyau = Argumentation.depuis_numeros(self.etiquettes, attaquants, cibles, bits(indecis))
+            #Le noyau partage les étiquetages de composantes déjà calculés
+            noyau._memo_composantes = self._memo_composantes
+        rapport = {
+            "arguments_retires": len(self.arguments) - len(noyau.arguments),
+            "attaques_retirees": self._nombre_attaques() - noyau._nombre_attaques(),
+            #Un argument qui s'attaque lui même ne peut jamais être IN, le moteur d'étiquetage
+            #l'écarte dès la propagation
+            "auto_attaquants": auto_attaquants,
+        }
+        return noyau, self._vers_ensemble(g_in), rapport
+
+    #Cette fonction produit les extensions d'une sémantique ("CO", "ST", "GR" ou "PR") une par une,
+    #l'appelant peut donc s'arrêter dès qu'il a ce qu'il cherche.
+    #moteur="etiquetage" utilise le moteur d'étiquetage, moteur="sat" le solveur SAT de sat.py,
+    #moteur="numpy" vérifie des lots de sous ensembles avec NumPy, moteur="naif" parcourt tous les sous ensembles
+    #Avec un budget (voir budget.py), la recherche lève BudgetDepasse quand il est épuisé.
+    def iter_extensions(self, semantique, moteur="etiquetage", budget=None):
+        if semantique not in SEMANTIQUES:
+            raise ValueError(f"Sémantique inconnue: {semantique}")
+        if semantique == "GR":
+            #L'extension fondée est unique et se calcule directement
+            return iter([self.extension_grounded()])
+        if semantique == "PR":
+            if moteur == "etiquetage":
+                #Recherche directe des ensembles admissibles maximaux, voir _iter_preferes
+                return (self._vers_ensemble(masque) for masque in self._iter_preferes(budget=budget))
+            #Avec les autres moteurs on garde les extensions complètes maximales
+            completes = list(self.iter_extensions("CO", moteur, budget))
+            return (ext for ext in completes if not any(ext < autre for autre in completes))
+        if moteur in ("etiquetage", "sat", "numpy"):
+            #La recherche se fait sur le noyau simplifié, on rajoute ensuite les arguments fixés
+            noyau, fixes, _ = self.simplify()
+            return (fixes | noyau._vers_ensemble(masque) for masque in noyau._masques(semantique, moteur, budget))
+        if moteur == "naif":
+            return self._iter_naif(semantique, budget)
+        raise ValueError(f"Moteur inconnu: {moteur}")
+
+    #Parcours de tous les sous ensembles dans l'ordre du code de Gray: d'un sous ensemble au suivant un
+    #seul argument entre ou sort, la fonction caractéristique est mise à jour en O(deg) à chaque pas
+    def _iter_naif(self, semantique, budget=None):
+        caracteristique = FonctionCaracteristique(self.masque_attaquants, self.masque_cibles)
+        verification = caracteristique.complete if semantique == "CO" else caracteristique.stable
+        compteurs = profil.ACTIF.compteurs if profil.ACTIF is not None else None
+        for k in range(1 << len(self.etiquettes)):
+            if budget is not None:
+                budget.verifier()
+            if k:
+                #Le bit qui change entre les codes de Gray de k - 1 et de k
+                i = (k & -k).bit_length() - 1
+                if caracteristique.dans[i]:
+                    caracteristique.retirer(i)
+                else:
+                    caracteristique.ajouter(i)
+            if compteurs is not None:
+                compteurs["sous_ensembles"] += 1
+            if verification():
+                yield self._vers_ensemble(caracteristique.masque)
+
+    #Masques des extensions complètes ("CO") ou stables ("ST") avec l'un des moteurs etiquetage, sat
+    #ou numpy. Une extension complète correspond exactement à l'ensemble IN d'un étiquetage complet,
+    #et une extension stable à un étiquetage complet sans argument UNDEC.
+    def _masques(self, semantique, moteur, budget=None):
+        if moteur == "sat":
+            #Encodage CNF des étiquetages et solveur CDCL, voir sat.py
+            return enumerer_extensions(self.masque_attaquants, semantique == "ST", budget)
+        if moteur == "numpy":
+            #Parcours de tous les sous ensembles par lots vectorisés, voir vectoriel.py. NumPy n'est
+            #importé qu'ici, les autres moteurs n'en paient pas le chargement
+            from vectoriel import MatriceAttaques
+            return MatriceAttaques(self).iter_masques(semantique, budget)
+        return self._iter_masques(semantique == "ST", budget=budget)
+
+    #Nombre d'extensions d'une sémantique: les extensions sont comptées sous forme de masques, sans
+    #construire les ensembles d'étiquettes. Si le budget est dépassé, partiel donne le nombre déjà compté
+    def compter_extensions(self, semantique, moteur="etiquetage", budget=None):
+        if semantique == "GR":
+            return 1
+        if semantique == "PR" and moteur == "etiquetage":
+            masques = self._iter_preferes(budget=budget)
+        elif semantique in ("CO", "ST") and moteur in ("etiquetage", "sat", "numpy"):
+            masques = self.simplify()[0]._masques(semantique, moteur, budget)
+        else:
+            masques = self.iter_extensions(semantique, moteur, budget)
+        nombre = 0
+        try:
+            for _ in masques:
+                nombre += 1
+        except BudgetDepasse as depassement:
+            depassement.partiel = nombre
+            raise
+        return nombre
+
+    #Acceptation crédule: l'argument appartient il à au moins une extension ?
+    #On cherche directement une extension qui contient l'argument et on s'arrête à la première.
+    #Avec temoin=True on renvoie aussi cette extension (ou None si la réponse est non)
+    #Pour les extensions préférées il suffit d'un ensemble admissible qui contient l'argument: le premier
+    #trouvé par _iter_preferes est de plus maximal, c'est donc une extension préférée.
+    def credulous(self, arg, semantique, temoin=False, budget=None):
+        if semantique == "GR" or arg not in self.ids:
+            extension = self.extension_grounded()
+            trouvee = extension if arg in extension else None
+        elif semantique == "PR":
+            trouvee = next(self._iter_preferes((1 << self.ids[arg], 0), budget), None)
+            if trouvee is not None:
+                trouvee = self._vers_ensemble(trouvee)
+        else:
+            bit = 1 << self.ids[arg]
+            trouvee = next(self._iter_masques(semantique == "ST", (bit, 0, 0), budget), None)
+            if trouvee is not None:
+                trouvee = self._vers_ensemble(trouvee)
+        return (trouvee is not None, trouvee) if temoin else trouvee is not None
+
+    #Acceptation sceptique: l'argument appartient il à toutes les extensions ?
+    #On cherche une extension qui ne contient pas l'argument (OUT ou UNDEC), la première trouvée
+    #est un contre exemple. Avec temoin=True on renvoie aussi ce contre exemple (ou None)
+    def skeptical(self, arg, semantique, temoin=False, budget=None):
+        contre_exemple = None
+        if semantique in ("GR", "CO"):
+            #L'extension fondée est la plus petite extension complète
+            extension = self.extension_grounded()
+            if arg not in extension:
+                contre_exemple = extension
+        elif arg not in self.ids:
+            contre_exemple = next(self.iter_extensions(semantique, budget=budget), None)
+        elif semantique == "PR":
+            #Les extensions préférées contiennent l'extension fondée, sinon on s'arrête à la première
+            #extension préférée qui ne contient pas l'argument
+            bit = 1 << self.ids[arg]
+            if not self._grounded()[0] & bit:
+                masque = next((masque for masque in self._iter_preferes(budget=budget) if not masque & bit), None)
+                if masque is not None:
+                    contre_exemple = self._vers_ensemble(masque)
+        else:
+            bit = 1 << self.ids[arg]
+            masque = next(self._iter_masques(True, (0, bit, 0), budget), None)
+            if masque is not None:
+                contre_exemple = self._vers_ensemble(masque)
+        accepte = contre_exemple is None
+        return (accepte, contre_exemple) if temoin else accepte
+
+    #Cette fonction renvoie les extensions préférées d'une argumentation
+    def extensions_preferred(self, budget=None):
+        return self._lister("PR", budget)
+
+    #Recherche des extensions préférées (ensembles admissibles maximaux) sous forme de masques, sans
+    #passer par les extensions complètes. Chaque argument est soit IN, soit exclu, et on parcourt l'arbre
+    #en essayant IN avant exclu: deux feuilles diffèrent d'abord sur un argument IN dans la première et
+    #exclu dans la seconde, une feuille ne peut donc jamais contenir une feuille trouvée avant elle.
+    #Il suffit alors d'écarter les feuilles contenues dans une extension déjà trouvée pour que chaque
+    #feuille restante soit maximale, et on élague toute branche dont les arguments IN et libres sont
+    #contenus dans une extension trouvée (subsomption).
+    #impose permet de fixer à l'avance des arguments (masques IN, exclus)
+    def _iter_preferes(self, impose=(0, 0), budget=None):
+        #Toute extension préférée contient l'extension fondée, et un argument qui s'attaque lui même
+        #n'est dans aucun ensemble admissible
+        g_in, g_out = self._grounded()
+        auto_attaquants = masque_de([i for i, attaquants in enumerate(self.masque_attaquants) if attaquants >> i & 1])
+        m_in, m_exclu = g_in | impose[0], g_out | auto_attaquants | impose[1]
+        if m_in & m_exclu:
+            return
+        depart = self._propager_admissible(m_in, m_exclu, self._tous)
+        if depart is None:
+            return
+        ordre = sorted(range(len(self.etiquettes)), key=lambda i: (-self.masque_attaquants[i].bit_count(), i))
+        trouvees = []
+        #Compteurs du profil actif (voir profil.py), None si l'instrumentation est désactivée
+        compteurs = profil.ACTIF.compteurs if profil.ACTIF is not None else None
+        pile = [depart]
+        while pile:
+            if budget is not None:
+                budget.verifier()
+            m_in, m_exclu = pile.pop()
+            if compteurs is not None:
+                compteurs["noeuds"] += 1
+            libres = self._tous & ~(m_in | m_exclu)
+            if any(not (m_in | libres) & ~extension for extension in trouvees):
+                if compteurs is not None:
+                    compteurs["branches_elaguees"] += 1
+                continue
+            if not libres:
+                trouvees.append(m_in)
+                yield m_in
+                continue
+            i = next(i for i in ordre if libres >> i & 1)
+            bit = 1 << i
+            #On empile exclu puis IN pour explorer IN en premier
+            for essai in ((m_in, m_exclu | bit, self.masque_cibles[i]),
+                          (m_in | bit, m_exclu, bit | self.masque_attaquants[i])):
+                etat = self._propager_admissible(*essai)
+                if etat is not None:
+                    pile.append(etat)
+                elif compteurs is not None:
+                    compteurs["branches_elaguees"] += 1
+
+    #Propagation pour les ensembles admissibles (masques IN et exclus):
+    # - les attaquants et les cibles d'un argument IN sont exclus (sans conflit)
+    # - un argument qui attaque un argument IN doit être attaqué par un argument IN (défense), s'il ne
+    #   reste qu'un seul attaquant non exclu celui ci devient IN
+    #Renvoie les nouveaux masques, ou None en cas de conflit
+    def _propager_admissible(self, m_in, m_exclu, a_verifier):
+        attaquants_de, cibles_de = self.masque_attaquants, self.masque_cibles
+        while a_verifier:
+            bit = a_verifier & -a_verifier
+            a_verifier ^= bit
+            i = bit.bit_length() - 1
+            vers_exclu = attaquants_de[i] | cibles_de[i] if bit & m_in else 0
+            vers_in = 0
+            if cibles_de[i] & m_in:
+                defenseurs = attaquants_de[i] & ~m_exclu
+                if not defenseurs:
+                    return None
+                if not defenseurs & m_in and not defenseurs & (defenseurs - 1):
+                    vers_in = defenseurs
+            if vers_exclu & m_in or vers_in & m_exclu:
+                return None
+            #Un argument nouvellement exclu ne peut plus défendre: ses cibles sont revérifiées
+            for j in bits(vers_exclu & ~m_exclu):
+                a_verifier |= cibles_de[j]
+            m_exclu |= vers_exclu
+            if vers_in:
+                #Un nouvel argument IN doit à son tour être défendu contre ses attaquants
+                m_in |= vers_in
+                a_verifier |= vers_in | attaquants_de[vers_in.bit_length() - 1]
+        return m_in, m_exclu
+
+    #Cette fonction vérifie si un sous ensemble est une extension complète, comme dans le cours:
+    def est_complete(self, sousens):
+        #il est admissible et il contient tous les arguments qu'il défend: S = F(S)
+        return self._caracteristique(sousens).complete()
+
+    #Cette fonction vérifie si un sous ensemble est une extension stable, comme dans le cours:
+    def est_stable(self, sousens):
+        #il est sans conflit et tout argument qui n'est pas dans sousens est attaqué
+        return self._caracteristique(sousens).stable()
+
+    #Moteur d'étiquetage: on attribue IN, OUT ou UNDEC à chaque argument en propageant les
+    #contraintes d'un étiquetage complet:
+    # - un argument est IN si et seulement si tous ses attaquants sont OUT
+    # - un argument est OUT si et seulement si l'un de ses attaquants est IN
+    # - sinon il est UNDEC (interdit pour les extensions stables)
+    #Une branche est abandonnée dès qu'une de ces règles ne peut plus être respectée
+    def etiquetages(self, stable=False):
+        for masque in self._iter_masques(stable):
+            yield self._vers_ensemble(masque)
+
+    #Même recherche mais les extensions sont produites sous forme de masques.
+    #impose permet de fixer à l'avance des étiquettes (masques IN, OUT, UNDEC)
+    def _iter_masques(self, stable, impose=(0, 0, 0), budget=None):
+        #L'extension fondée est contenue dans tous les étiquetages complets: on part de celle ci
+        g_in, g_out = self._grounded()
+        m_in, m_out, m_undec = g_in | impose[0], g_out | impose[1], impose[2]
+        if m_in & m_out or m_undec & (m_in | m_out) or (stable and m_undec):
+            return
+        depart = self._propager((m_in, m_out, m_undec), self._tous, stable)
+        if depart is None:
+            return
+        for etat in self._decomposer(depart, stable, budget):
+            yield etat[0]
+
+    #Décomposition en composantes fortement connexes: les arguments encore libres sont découpés en
+    #composantes, résolues dans l'ordre topologique. Les étiquetages d'une composante ne dépendent que
+    #des étiquettes de ses attaquants en amont, on les calcule donc une seule fois par conditionnement
+    #et on les combine avec ceux des composantes suivantes: 2^|composante| au lieu de 2^n.
+    def _decomposer(self, depart, stable, budget=None):
+        fixes = depart[0] | depart[1] | depart[2]
+        composantes = []
+        for composante in self._composantes(self._tous & ~fixes):
+            entrees = 0
+            for i in bits(composante):
+                entrees |= self.masque_attaquants[i]
+            composantes.append((composante, entrees & ~composante, self._attaques_par(composante) & fixes,
+                                self._signature(composante)))
+        #Une composante qui ne dépend que d'arguments fixés et qui n'a aucun étiquetage (possible pour
+        #les extensions stables) rend la recherche inutile: on le vérifie avant de combiner
+        for composante, entrees, aval, signature in composantes:
+            if not entrees & ~fixes and not self._locales(composante, entrees, signature, depart, stable, budget):
+                return
+        pile = [(0, depart)]
+        while pile:
+            if budget is not None:
+                budget.verifier()
+            k, (m_in, m_out, m_undec) = pile.pop()
+            if k == len(composantes):
+                yield m_in, m_out, m_undec
+                continue
+            composante, entrees, aval, signature = composantes[k]
+            suites = []
+            for l_in, l_out, l_undec in self._locales(composante, entrees, signature, (m_in, m_out, m_undec), stable,
+                                                      budget):
+                #Les étiquettes déjà forcées dans la composante doivent être respectées
+                if m_in & composante & ~l_in or m_out & composante & ~l_out or m_undec & composante & ~l_undec:
+                    continue
+                #Les arguments fixés avant la décomposition et attaqués par la composante sont revérifiés
+                etat = self._propager((m_in | l_in, m_out | l_out, m_undec | l_undec), aval, stable, fixes)
+                if etat is not None:
+                    suites.append((k + 1, etat))
+            pile.extend(reversed(suites))
+
+    #Contenu d'une composante indépendant de la numérotation: ses arguments et ses attaques internes
+    def _signature(self, composante):
+        return (frozenset(self.etiquettes[i] for i in bits(composante)),
+                frozenset((self.etiquettes[j], self.etiquettes[i])
+                          for i in bits(composante) for j in bits(self.masque_attaquants[i] & composante)))
+
+    #Étiquetages d'une composante pour l'étiquetage etat de ses attaquants en amont. Ils ne dépendent
+    #que du contenu de la composante et, pour chacun de ses arguments, de savoir si un attaquant en
+    #amont est IN ou à défaut UNDEC: c'est la clé du mémo, qui survit aux modifications.
+    def _locales(self, composante, entrees, signature, etat, stable, budget=None):
+        m_in, m_out, m_undec = etat
+        statuts = frozenset((self.etiquettes[i], bool(self.masque_attaquants[i] & entrees & m_in))
+                            for i in bits(composante) if self.masque_attaquants[i] & entrees & (m_in | m_undec))
+        cle = (stable, signature, statuts)
+        locales = self._memo_composantes.get(cle)
+        profil.compter("memo_composantes_misses" if locales is None else "memo_composantes_hits")
+        if locales is None:
+            conditionnement = (m_in & entrees, m_out & entrees, m_undec & entrees)
+            locales = [tuple(frozenset(self._vers_ensemble(masque & composante)) for masque in etiquetage)
+                       for etiquetage in self._rechercher(conditionnement, composante, stable, budget)]
+            if len(self._memo_composantes) >= MEMO_MAX:
+                self._memo_composantes.clear()
+            self._memo_composantes[cle] = locales
+        return [tuple(self._vers_masque(etiquettes) for etiquettes in etiquetage) for etiquetage in locales]
+
+    #Recherche des étiquetages complets des arguments de portee à partir de l'étiquetage depart.
+    #Un étiquetage est un triplet de masques (IN, OUT, UNDEC), on parcourt l'arbre de recherche avec
+    #une pile pour ne pas dépendre de la limite de récursion sur les grandes argumentations
+    def _rechercher(self, depart, portee, stable, budget=None):
+        depart = self._propager(depart, portee, stable, portee)
+        if depart is None:
+            return
+        #On choisit d'abord les arguments les plus attaqués, leurs étiquettes se propagent plus loin
+        ordre = sorted(bits(portee), key=lambda i: (-self.masque_attaquants[i].bit_count(), i))
+        compteurs = profil.ACTIF.compteurs if profil.ACTIF is not None else None
+        pile = [depart]
+        while pile:
+            if budget is not None:
+                budget.verifier()
+            m_in, m_out, m_undec = pile.pop()
+            if compteurs is not None:
+                compteurs["noeuds"] += 1
+            libres = portee & ~(m_in | m_out | m_undec)
+            #Tous les arguments sont étiquetés, on a un étiquetage complet de la portée
+            if not libres:
+                yield m_in, m_out, m_undec
+                continue
+            i = next(i for i in ordre if libres >> i & 1)
+            bit = 1 << i
+            voisins = (bit | self.masque_attaquants[i] | self.masque_cibles[i]) & portee
+            #On empile dans l'ordre inverse pour explorer IN, puis OUT, puis UNDEC
+            essais = [(m_in, m_out | bit, m_undec), (m_in | bit, m_out, m_undec)]
+            if not stable:
+                essais.insert(0, (m_in, m_out, m_undec | bit))
+            for essai in essais:
+                etat = self._propager(essai, voisins, stable, portee)
+                if etat is not None:
+                    pile.append(etat)
+                elif compteurs is not None:
+                    compteurs["branches_elaguees"] += 1
+
+    #Algorithme de Tarjan (version itérative) sur les arguments de portee: renvoie les masques des
+    #composantes fortement connexes dans l'ordre topologique, les composantes en amont d'abord
+    def _composantes(self, portee):
+        index, bas = {}, {}
+        pile, sur_pile = [], 0
+        composantes = []
+        for racine in bits(portee):
+            if racine in index:
+                continue
+            index[racine] = bas[racine] = len(index)
+            pile.append(racine)
+            sur_pile |= 1 << racine
+            travail = [(racine, bits(self.masque_cibles[racine] & portee))]
+            while travail:
+                noeud, successeurs = travail[-1]
+                for suivant in successeurs:
+                    if suivant not in index:
+                        index[suivant] = bas[suivant] = len(index)
+                        pile.append(suivant)
+                        sur_pile |= 1 << suivant
+                        travail.append((suivant, bits(self.masque_cibles[suivant] & portee)))
+                        break
+                    if sur_pile >> suivant & 1:
+                        bas[noeud] = min(bas[noeud], index[suivant])
+                else:
+                    travail.pop()
+                    if travail:
+                        parent = travail[-1][0]
+                        bas[parent] = min(bas[parent], bas[noeud])
+                    if bas[noeud] == index[noeud]:
+                        composante = 0
+                        while True:
+                            membre = pile.pop()
+                            sur_pile &= ~(1 << membre)
+                            composante |= 1 << membre
+                            if membre == noeud:
+                                break
+                        composantes.append(composante)
+        #Tarjan termine une composante après toutes celles qu'elle attaque
+        composantes.reverse()
+        return composantes
+
+    #Cette fonction vérifie les règles de chaque argument de a_verifier et force les étiquettes qui
+    #n'ont plus qu'une seule possibilité. Elle renvoie le nouvel étiquetage, ou None en cas de conflit.
+    #Seuls les arguments de portee sont revérifiés quand un voisin change d'étiquette.
+    def _propager(self, etat, a_verifier, stable, portee=None):
+        if portee is None:
+            portee = self._tous
+        m_in, m_out, m_undec = etat
+        attaquants_de, cibles_de = self.masque_attaquants, self.masque_cibles
+        while a_verifier:
+            bit = a_verifier & -a_verifier
+            a_verifier ^= bit
+            attaquants = attaquants_de[bit.bit_length() - 1]
+            libres = attaquants & ~(m_in | m_out | m_undec)
+            vers_in = vers_out = vers_undec = 0
+            if attaquants & m_in:
+                #Un attaquant est IN, l'argument est forcément OUT
+                vers_out = bit
+            elif not attaquants & ~m_out:
+                #Tous les attaquants sont OUT, l'argument est forcément IN
+                vers_in = bit
+            elif bit & m_in:
+                #Un argument IN doit avoir tous ses attaquants OUT
+                if attaquants & m_undec:
+                    return None
+                vers_out = libres
+            elif bit & m_out:
+                #Un argument OUT doit avoir un attaquant IN parmi ceux qui ne sont pas encore étiquetés
+                if not libres:
+                    return None
+                if not libres & (libres - 1):
+                    vers_in = libres
+            elif bit & m_undec:
+                #Un argument UNDEC ne peut pas avoir tous ses attaquants OUT
+                if not attaquants & m_undec and libres and not libres & (libres - 1):
+                    vers_undec = libres
+            if vers_in:
+                if vers_in & (m_out | m_undec):
+                    return None
+                nouveaux = vers_in & ~m_in
+                m_in |= vers_in
+            elif vers_out:
+                if vers_out & (m_in | m_undec):
+                    return None
+                nouveaux = vers_out & ~m_out
+                m_out |= vers_out
+            elif vers_undec:
+                if stable or vers_undec & (m_in | m_out):
+                    return None
+                nouveaux = vers_undec & ~m_undec
+                m_undec |= vers_undec
+            else:
+                continue
+            #Les arguments nouvellement étiquetés et leurs voisins doivent être revérifiés
+            for i in bits(nouveaux):
+                a_verifier |= ((1 << i) | attaquants_de[i] | cibles_de[i]) & portee
+        return m_in, m_out, m_undec
+
+    #Cette fonction produit toutes les combinaisons de sous ensemble de l'argumentation, une par une,
+    #sans jamais garder la liste des 2^n sous ensembles en mémoire
     def multi_ensemble(self):
-        ensemble = []
         for r in range(len(self.arguments) + 1):
             for combinaison in combinations(self.arguments, r):
-                ensemble.append(set(combinaison))
-        return ensemble 
-
-
+                yield set(combinaison)
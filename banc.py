@@ -0,0 +1,240 @@
+import argparse
+import importlib.util
+import json
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from argumentation import Argumentation, MOTEURS, SEMANTIQUES
+from budget import Budget, BudgetDepasse, memoire_max
+from project import repondre
+
+#Banc d'essai: génération d'argumentations synthétiques (fichiers .apx) et mesure des temps de
+#SE, DC et DS pour chaque sémantique et chaque moteur quand la taille n augmente.
+#Chaque mesure se fait dans un processus neuf pour que le pic de mémoire lui soit propre, avec un
+#délai (voir budget.py): une mesure qui le dépasse est marquée incomplète au lieu de bloquer le banc.
+#Les résultats (JSON) peuvent être comparés à une référence enregistrée pour repérer les régressions.
+
+FAMILLES = ("aleatoire", "grille", "sans_echelle", "composantes")
+PROBLEMES = ("SE", "DC", "DS")
+REFERENCE_PAR_DEFAUT = "banc_reference.json"
+#Les moteurs naif et numpy parcourent 2^n sous ensembles: on ne les mesure que pour n petit
+N_MAX_EXPONENTIEL = 20
+#En dessous de cet écart (en secondes) une mesure plus lente n'est pas une régression
+ECART_MIN = 0.05
+
+
+#Les arguments sont nommés a0, a1, ..., a(n-1); une argumentation est une liste d'attaques (i, j)
+
+#Graphe aléatoire: degre * n attaques distinctes tirées uniformément, sans auto attaque
+def generer_aleatoire(n, graine, degre=2.0):
+    alea = random.Random(graine)
+    nombre = min(round(degre * n), n * (n - 1))
+    attaques = set()
+    while len(attaques) < nombre:
+        i, j = alea.randrange(n), alea.randrange(n)
+        if i != j:
+            attaques.add((i, j))
+    return sorted(attaques)
+
+
+#Grille: chaque argument est relié à ses voisins de droite et du bas, l'attaque va dans un sens,
+#dans l'autre ou dans les deux (attaque mutuelle)
+def generer_grille(n, graine):
+    alea = random.Random(graine)
+    cote = math.ceil(math.sqrt(n))
+    attaques = []
+    for i in range(n):
+        for j in (i + 1 if (i + 1) % cote else n, i + cote):
+            if j >= n:
+                continue
+            sens = alea.randrange(3)
+            if sens != 1:
+                attaques.append((i, j))
+            if sens != 0:
+                attaques.append((j, i))
+    return attaques
+
+
+#Graphe sans échelle (attachement préférentiel de Barabási-Albert): chaque nouvel argument est relié
+#à m arguments déjà présents, choisis proportionnellement à leur degré, dans un sens tiré au hasard
+def generer_sans_echelle(n, graine, m=2):
+    alea = random.Random(graine)
+    attaques = set()
+    #Chaque argument y apparaît autant de fois que son degré
+    extremites = list(range(min(m, n)))
+    for i in range(min(m, n), n):
+        voisins = set()
+        while len(voisins) < m:
+            voisins.add(alea.choice(extremites))
+        for j in voisins:
+            attaques.add((i, j) if alea.random() < 0.5 else (j, i))
+            extremites.extend((i, j))
+    return sorted(attaques)
+
+
+#Beaucoup de composantes fortement connexes: les arguments sont découpés en blocs de taille
+#arguments, chaque bloc est un cycle avec quelques cordes, et chaque bloc attaque le suivant
+def generer_composantes(n, graine, taille=5):
+    alea = random.Random(graine)
+    attaques = set()
+    for debut in range(0, n, taille):
+        bloc = list(range(debut, min(debut + taille, n)))
+        if len(bloc) > 1:
+            for k, i in enumerate(bloc):
+                attaques.add((i, bloc[(k + 1) % len(bloc)]))
+            for _ in range(len(bloc) // 2):
+                i, j = alea.sample(bloc, 2)
+                attaques.add((i, j))
+        if debut + taille < n:
+            attaques.add((alea.choice(bloc), alea.randrange(debut + taille, min(debut + 2 * taille, n))))
+    return sorted(attaques)
+
+
+GENERATEURS = {
+    "aleatoire": generer_aleatoire,
+    "grille": generer_grille,
+    "sans_echelle": generer_sans_echelle,
+    "composantes": generer_composantes,
+}
+
+
+def ecrire_apx(chemin, n, attaques):
+    with open(chemin, "w") as fichier:
+        for i in range(n):
+            fichier.write(f"arg(a{i}).\n")
+        for i, j in attaques:
+            fichier.write(f"att(a{i},a{j}).\n")
+
+
+#Écrit l'argumentation d'une famille dans dossier (si elle n'y est pas déjà) et renvoie son chemin
+def generer_fichier(dossier, famille, n, graine):
+    os.makedirs(dossier, exist_ok=True)
+    chemin = os.path.join(dossier, f"{famille}_{n}_{graine}.apx")
+    if not os.path.exists(chemin):
+        ecrire_apx(chemin, n, GENERATEURS[famille](n, graine))
+    return chemin
+
+
+#Une mesure, exécutée dans un processus neuf. SE énumère les extensions, DC et DS portent sur a0.
+def mesurer(chemin, semantique, moteur, probleme, timeout):
+    af = Argumentation.fichier_vers_arg(chemin)
+    budget = Budget(timeout)
+    nombre, incomplet = 0, False
+    debut = time.perf_counter()
+    try:
+        if probleme == "SE":
+            for _ in af.iter_extensions(semantique, moteur, budget):
+                nombre += 1
+        else:
+            repondre(af, f"{probleme}-{semantique}", "a0", moteur, budget=budget)
+    except BudgetDepasse:
+        incomplet = True
+    temps = time.perf_counter() - debut
+    resultat = {"temps": round(temps, 6), "memoire_max": round(memoire_max() / (1024 * 1024), 1),
+                "incomplet": incomplet}
+    if probleme == "SE":
+        resultat["extensions"] = nombre
+        resultat["extensions_par_seconde"] = round(nombre / temps, 1) if temps > 0 else None
+    return resultat
+
+
+#Les moteurs utilisables pour une taille donnée
+def moteurs_possibles(moteurs, n):
+    for moteur in moteurs:
+        if moteur in ("naif", "numpy") and n > N_MAX_EXPONENTIEL:
+            continue
+        if moteur == "numpy" and importlib.util.find_spec("numpy") is None:
+            continue
+        yield moteur
+
+
+def lancer(familles, tailles, semantiques, moteurs, problemes, graine, dossier, timeout):
+    mesures = []
+    #Un processus par mesure (max_tasks_per_child=1): le pic de mémoire est celui de la mesure seule
+    with ProcessPoolExecutor(max_workers=1, max_tasks_per_child=1) as executeur:
+        for famille in familles:
+            for n in tailles:
+                chemin = generer_fichier(dossier, famille, n, graine)
+                for semantique in semantiques:
+                    for moteur in moteurs_possibles(moteurs, n):
+                        for probleme in problemes:
+                            resultat = executeur.submit(mesurer, chemin, semantique, moteur, probleme,
+                                                        timeout).result()
+                            mesure = {"famille": famille, "n": n, "semantique": semantique, "moteur": moteur,
+                                      "probleme": probleme, **resultat}
+                            print(json.dumps(mesure), file=sys.stderr)
+                            mesures.append(mesure)
+    return {"graine": graine, "timeout": timeout, "mesures": mesures}
+
+
+def _cle(mesure):
+    return mesure["famille"], mesure["n"], mesure["semantique"], mesure["moteur"], mesure["probleme"]
+
+
+#Les mesures nettement plus lentes que la référence (de plus de tolerance en proportion et de plus
+#de ECART_MIN secondes), ou incomplètes alors que la référence était complète
+def comparer(resultats, reference, tolerance):
+    anciennes = {_cle(mesure): mesure for mesure in reference["mesures"]}
+    regressions = []
+    for mesure in resultats["mesures"]:
+        ancienne = anciennes.get(_cle(mesure))
+        if ancienne is None:
+            continue
+        if mesure["incomplet"] and not ancienne["incomplet"]:
+            regressions.append((mesure, ancienne))
+        elif (mesure["temps"] > ancienne["temps"] * (1 + tolerance)
+              and mesure["temps"] - ancienne["temps"] > ECART_MIN):
+            regressions.append((mesure, ancienne))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Argumentation Solveur (banc d'essai)")
+    parser.add_argument("--families", nargs="+", choices=FAMILLES, default=list(FAMILLES))
+    parser.add_argument("--sizes", nargs="+", type=int, default=[10, 20, 40])
+    parser.add_argument("--semantics", nargs="+", choices=SEMANTIQUES, default=list(SEMANTIQUES))
+    parser.add_argument("--engines", nargs="+", choices=MOTEURS, default=["etiquetage", "sat"])
+    parser.add_argument("--problems", nargs="+", choices=PROBLEMES, default=list(PROBLEMES))
+    parser.add_argument("--seed", type=int, default=0)
+    #Dossier des fichiers .apx générés
+    parser.add_argument("--dir", default="banc_af")
+    #Délai de chaque mesure, en secondes
+    parser.add_argument("--timeout", type=float, default=10.0)
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--baseline", default=REFERENCE_PAR_DEFAUT)
+    #Enregistre les résultats comme nouvelle référence au lieu de les comparer
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.5)
+    args = parser.parse_args(argv)
+
+    resultats = lancer(args.families, args.sizes, args.semantics, args.engines, args.problems, args.seed,
+                       args.dir, args.timeout)
+    texte = json.dumps(resultats, indent=1)
+    if args.save_baseline:
+        with open(args.baseline, "w") as fichier:
+            fichier.write(texte + "\n")
+        return
+    if args.output:
+        with open(args.output, "w") as fichier:
+            fichier.write(texte + "\n")
+    else:
+        print(texte)
+    if not os.path.exists(args.baseline):
+        return
+    with open(args.baseline) as fichier:
+        reference = json.load(fichier)
+    regressions = comparer(resultats, reference, args.tolerance)
+    for mesure, ancienne in regressions:
+        print(f"Régression: {' '.join(str(valeur) for valeur in _cle(mesure))}: "
+              f"{ancienne['temps']} s -> {mesure['temps']} s"
+              + (" (incomplet)" if mesure["incomplet"] else ""), file=sys.stderr)
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import multiprocessing
+import sys
+import time
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+#Budgets de temps et de mémoire pour les recherches d'extensions. Les moteurs appellent verifier() dans
+#leurs boucles principales: la vérification est coopérative, la recherche s'arrête proprement à la
+#prochaine vérification et lève BudgetDepasse. Les extensions déjà trouvées restent utilisables.
+
+#Nombre d'appels à verifier() entre deux vérifications réelles de l'horloge et de la mémoire.
+#Le premier appel vérifie toujours, un budget déjà épuisé arrête donc la recherche dès le départ.
+PERIODE = 256
+
+
+class BudgetDepasse(Exception):
+    def __init__(self, raison, partiel=None):
+        super().__init__(raison)
+        self.raison = raison
+        #Résultat partiel (extensions trouvées, nombre d'extensions...) rempli par l'appelant
+        self.partiel = partiel
+        #Sortie de project.py correspondant au résultat partiel
+        self.sortie = None
+
+
+#Pic de mémoire du processus en octets (0 si le système ne le fournit pas)
+def memoire_max():
+    if resource is None:
+        return 0
+    pic = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    #Linux donne des kilo-octets, macOS des octets
+    return pic if sys.platform == "darwin" else pic * 1024
+
+
+class Budget:
+    #timeout en secondes, max_memoire en octets; echeance (date absolue, time.time()) permet de
+    #transmettre le même délai à d'autres processus, annulation est un multiprocessing.Event obtenu
+    #par signal() sur le budget d'un autre processus
+    def __init__(self, timeout=None, max_memoire=None, echeance=None, annulation=None):
+        if echeance is None and timeout is not None:
+            echeance = time.time() + timeout
+        self.echeance = echeance
+        self.max_memoire = max_memoire
+        self.annule = False
+        self.annulation = annulation
+        self._signaux = []
+        self._appels = 0
+
+    #Annulation depuis un autre fil d'exécution: la recherche s'arrête à la prochaine vérification,
+    #y compris dans les processus qui ont reçu un signal() de ce budget
+    def annuler(self):
+        self.annule = True
+        for signal in self._signaux:
+            signal.set()
+
+    #Événement partagé avec d'autres processus, levé par annuler()
+    def signal(self):
+        signal = multiprocessing.Event()
+        if self.annule:
+            signal.set()
+        self._signaux.append(signal)
+        return signal
+
+    def oublier(self, signal):
+        self._signaux.remove(signal)
+
+    def verifier(self):
+        if self._appels % PERIODE == 0:
+            self.verifier_maintenant()
+        self._appels += 1
+
+    def verifier_maintenant(self):
+        if self.annule or self.annulation is not None and self.annulation.is_set():
+            raise BudgetDepasse("recherche annulée")
+        if self.echeance is not None and time.time() > self.echeance:
+            raise BudgetDepasse("délai dépassé")
+        if self.max_memoire is not None and memoire_max() > self.max_memoire:
+            raise BudgetDepasse("mémoire dépassée")
+
+    #Secondes restantes avant l'échéance (None sans délai)
+    def restant(self):
+        if self.echeance is None:
+            return None
+        return max(0.0, self.echeance - time.time())
@@ -0,0 +1,94 @@
+import hashlib
+import os
+import sqlite3
+import time
+
+#Cache disque des extensions calculées, partagé entre les exécutions de project.py.
+#La clé est une empreinte SHA-256 du contenu de l'argumentation (étiquettes triées et attaques entre
+#arguments déclarés) et de la sémantique: deux fichiers identiques à l'ordre des lignes près partagent
+#donc la même entrée. Les extensions sont stockées en binaire, chacune sous forme de masque de
+#ceil(n/8) octets. La base SQLite gère les accès concurrents de plusieurs processus, l'éviction suit
+#l'ordre du dernier accès (LRU) quand la taille totale dépasse la limite.
+
+DOSSIER_PAR_DEFAUT = os.path.join(os.path.expanduser("~"), ".cache", "argumentation")
+#Taille maximale par défaut des extensions stockées, en octets
+TAILLE_PAR_DEFAUT = 64 * 1024 * 1024
+#À changer si le format des entrées change
+VERSION = b"argumentation-cache-1"
+
+
+class CacheResultats:
+    def __init__(self, dossier=None, taille_max=TAILLE_PAR_DEFAUT):
+        self.dossier = dossier or DOSSIER_PAR_DEFAUT
+        self.taille_max = taille_max
+        os.makedirs(self.dossier, exist_ok=True)
+        self.connexion = sqlite3.connect(os.path.join(self.dossier, "cache.sqlite"), timeout=30,
+                                         isolation_level=None)
+        self.connexion.execute("PRAGMA journal_mode=WAL")
+        self.connexion.execute("CREATE TABLE IF NOT EXISTS entrees ("
+                               "cle TEXT PRIMARY KEY, valeur BLOB, taille INTEGER, acces REAL)")
+        self.connexion.execute("CREATE TABLE IF NOT EXISTS statistiques (nom TEXT PRIMARY KEY, valeur INTEGER)")
+        self.connexion.execute("INSERT OR IGNORE INTO statistiques VALUES ('hits', 0), ('misses', 0)")
+
+    def fermer(self):
+        self.connexion.close()
+
+    #Empreinte canonique de l'argumentation et de la sémantique
+    @staticmethod
+    def cle(af, semantique):
+        empreinte = hashlib.sha256(VERSION)
+        empreinte.update(semantique.encode())
+        for etiquette in af.etiquettes:
+            empreinte.update(b"\x00" + str(etiquette).encode())
+        for j, masque in enumerate(af.masque_attaquants):
+            empreinte.update(b"\x01" + j.to_bytes(4, "little") + masque.to_bytes((masque.bit_length() + 7) // 8, "little"))
+        return empreinte.hexdigest()
+
+    #Codage binaire: nombre d'extensions puis un masque de taille fixe par extension
+    @staticmethod
+    def _coder(af, masques):
+        largeur = (len(af.etiquettes) + 7) // 8
+        return len(masques).to_bytes(4, "little") + b"".join(masque.to_bytes(largeur, "little") for masque in masques)
+
+    @staticmethod
+    def _decoder(af, valeur):
+        largeur = (len(af.etiquettes) + 7) // 8
+        nombre = int.from_bytes(valeur[:4], "little")
+        return [int.from_bytes(valeur[4 + k * largeur:4 + (k + 1) * largeur], "little") for k in range(nombre)]
+
+    #Renvoie la liste des extensions (ensembles d'étiquettes) ou None si elles ne sont pas en cache
+    def lire(self, af, semantique):
+        cle = self.cle(af, semantique)
+        ligne = self.connexion.execute("SELECT valeur FROM entrees WHERE cle = ?", (cle,)).fetchone()
+        if ligne is None:
+            self.connexion.execute("UPDATE statistiques SET valeur = valeur + 1 WHERE nom = 'misses'")
+            return None
+        self.connexion.execute("UPDATE entrees SET acces = ? WHERE cle = ?", (time.time(), cle))
+        self.connexion.execute("UPDATE statistiques SET valeur = valeur + 1 WHERE nom = 'hits'")
+        return [af._vers_ensemble(masque) for masque in self._decoder(af, ligne[0])]
+
+    def ecrire(self, af, semantique, extensions):
+        valeur = self._coder(af, [af._vers_masque(extension) for extension in extensions])
+        if len(valeur) > self.taille_max:
+            return
+        self.connexion.execute("BEGIN IMMEDIATE")
+        try:
+            self.connexion.execute("INSERT OR REPLACE INTO entrees VALUES (?, ?, ?, ?)",
+                                   (self.cle(af, semantique), valeur, len(valeur), time.time()))
+            #Éviction des entrées les moins récemment utilisées jusqu'à repasser sous la limite
+            total = self.connexion.execute("SELECT COALESCE(SUM(taille), 0) FROM entrees").fetchone()[0]
+            for cle, taille in self.connexion.execute("SELECT cle, taille FROM entrees ORDER BY acces").fetchall():
+                if total <= self.taille_max:
+                    break
+                self.connexion.execute("DELETE FROM entrees WHERE cle = ?", (cle,))
+                total -= taille
+            self.connexion.execute("COMMIT")
+        except BaseException:
+            self.connexion.execute("ROLLBACK")
+            raise
+
+    def statistiques(self):
+        resultat = dict(self.connexion.execute("SELECT nom, valeur FROM statistiques").fetchall())
+        resultat["entrees"], resultat["octets"] = self.connexion.execute(
+            "SELECT COUNT(*), COALESCE(SUM(taille), 0) FROM entrees").fetchone()
+        return resultat
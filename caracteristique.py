@@ -0,0 +1,89 @@
+from masques import bits
+
+#Fonction caractéristique F(S) = {arguments défendus par S}, tenue à jour quand on ajoute ou retire
+#un argument de S. Pour chaque argument on garde:
+# - le nombre de ses attaquants qui sont dans S (il est attaqué par S si ce nombre est non nul)
+# - le nombre de ses attaquants qui ne sont pas attaqués par S (il est dans F(S) si ce nombre est nul)
+#Ajouter ou retirer un argument a ne touche que ses cibles t, et les cibles de t quand t devient (ou
+#cesse d'être) attaqué par S: un pas coûte O(deg) au lieu de recalculer F(S) sur toutes les attaques.
+#Les tests sans conflit (aucune attaque dans S), admissible (S ⊆ F(S)), complet (S = F(S)) et stable
+#(S sans conflit attaque tout le reste) se lisent alors sur quelques compteurs.
+
+
+class FonctionCaracteristique:
+    #masque_attaquants et masque_cibles sont ceux de Argumentation, masque le sous ensemble S de départ
+    def __init__(self, masque_attaquants, masque_cibles, masque=0):
+        self.n = len(masque_attaquants)
+        self.cibles = [list(bits(cibles)) for cibles in masque_cibles]
+        self.dans = [False] * self.n
+        #Attaquants de chaque argument qui sont dans S
+        self.attaquants_dans = [0] * self.n
+        #Attaquants de chaque argument qui ne sont pas attaqués par S
+        self.non_contres = [attaquants.bit_count() for attaquants in masque_attaquants]
+        self.masque = 0
+        self.taille = 0
+        #Nombre d'arguments de F(S), d'arguments attaqués par S, d'attaques à l'intérieur de S et
+        #d'arguments de S qui ne sont pas dans F(S)
+        self.taille_f = self.non_contres.count(0)
+        self.attaques = 0
+        self.conflits = 0
+        self.non_defendus = 0
+        for i in bits(masque):
+            self.ajouter(i)
+
+    def ajouter(self, i):
+        dans, attaquants_dans, non_contres = self.dans, self.attaquants_dans, self.non_contres
+        dans[i] = True
+        self.masque |= 1 << i
+        self.taille += 1
+        #Les attaques entre i et S, une attaque de i sur lui même comptée une seule fois
+        self.conflits += attaquants_dans[i] + sum(dans[t] for t in self.cibles[i])
+        if non_contres[i]:
+            self.non_defendus += 1
+        for t in self.cibles[i]:
+            attaquants_dans[t] += 1
+            if attaquants_dans[t] == 1:
+                #t devient attaqué par S: ses cibles ont un attaquant non contré de moins
+                self.attaques += 1
+                for u in self.cibles[t]:
+                    non_contres[u] -= 1
+                    if not non_contres[u]:
+                        self.taille_f += 1
+                        if dans[u]:
+                            self.non_defendus -= 1
+
+    def retirer(self, i):
+        dans, attaquants_dans, non_contres = self.dans, self.attaquants_dans, self.non_contres
+        for t in self.cibles[i]:
+            attaquants_dans[t] -= 1
+            if not attaquants_dans[t]:
+                self.attaques -= 1
+                for u in self.cibles[t]:
+                    if not non_contres[u]:
+                        self.taille_f -= 1
+                        if dans[u]:
+                            self.non_defendus += 1
+                    non_contres[u] += 1
+        self.conflits -= attaquants_dans[i] + sum(dans[t] for t in self.cibles[i])
+        if non_contres[i]:
+            self.non_defendus -= 1
+        dans[i] = False
+        self.masque &= ~(1 << i)
+        self.taille -= 1
+
+    #Masque de F(S)
+    def defendus(self):
+        return sum(1 << j for j, nombre in enumerate(self.non_contres) if not nombre)
+
+    def sans_conflit(self):
+        return not self.conflits
+
+    def admissible(self):
+        return not self.conflits and not self.non_defendus
+
+    def complete(self):
+        return self.admissible() and self.taille_f == self.taille
+
+    #Sans conflit, S et les arguments qu'il attaque sont disjoints: ils doivent couvrir tout
+    def stable(self):
+        return not self.conflits and self.taille + self.attaques == self.n
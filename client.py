@@ -0,0 +1,68 @@
+import os
+import shlex
+import socket
+import sys
+
+#Client léger du démon (voir serveur.py): il n'utilise que les sockets et n'importe ni le solveur
+#ni asyncio, project.py --connect passe par ici avant tout autre import.
+
+#Marqueur et code de sortie d'un résultat incomplet, les mêmes que dans project.py
+MARQUEUR_INCOMPLET = "INCOMPLETE"
+CODE_INCOMPLET = 3
+#Débuts des réponses d'erreur du démon
+ERREURS = ("Erreur:", "Fichier illisible:", "Requête invalide:", "Les arguments -p et -f")
+
+
+#Une adresse est soit hote:port (TCP), soit le chemin d'une socket Unix
+def _connecter(adresse):
+    hote, separateur, port = adresse.rpartition(":")
+    if separateur and port.isdigit():
+        return socket.create_connection((hote or "127.0.0.1", int(port)))
+    connexion = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    connexion.connect(adresse)
+    return connexion
+
+
+#Envoie une requête (options de project.py) au démon et renvoie sa réponse.
+#Le chemin du fichier est rendu absolu puisque le démon ne tourne pas dans le même dossier.
+def interroger(adresse, arguments):
+    arguments = list(arguments)
+    if "-f" in arguments[:-1]:
+        position = arguments.index("-f") + 1
+        arguments[position] = os.path.abspath(arguments[position])
+    with _connecter(adresse) as connexion:
+        connexion.sendall(shlex.join(arguments).encode() + b"\n")
+        reponse = b""
+        while not reponse.endswith(b"\n"):
+            morceau = connexion.recv(65536)
+            if not morceau:
+                break
+            reponse += morceau
+    return reponse.decode().rstrip("\n")
+
+
+#Sépare l'adresse de --connect (ou --connect=adresse) des options de la requête
+def separer(argv):
+    for position, option in enumerate(argv):
+        if option == "--connect" and position + 1 < len(argv):
+            return argv[position + 1], argv[:position] + argv[position + 2:]
+        if option.startswith("--connect="):
+            return option.split("=", 1)[1], argv[:position] + argv[position + 1:]
+    return None, argv
+
+
+def main(argv):
+    adresse, requete = separer(argv)
+    try:
+        reponse = interroger(adresse, requete)
+    except OSError as erreur:
+        print(f"Connexion impossible à {adresse}: {erreur}", file=sys.stderr)
+        return 1
+    if not reponse:
+        print("Le démon n'a pas répondu", file=sys.stderr)
+        return 1
+    if reponse.startswith(ERREURS):
+        print(reponse, file=sys.stderr)
+        return 1
+    print(reponse)
+    return CODE_INCOMPLET if reponse.endswith(MARQUEUR_INCOMPLET) else 0
@@ -0,0 +1,190 @@
+import sys
+from array import array
+from bisect import bisect_left
+
+from argumentation import Argumentation
+
+#Argumentation compacte, pour garder en mémoire un grand nombre d'argumentations à la fois.
+#Au lieu des ensembles d'étiquettes et de paires, des index et des masques de Argumentation, on garde:
+# - la table des étiquettes, triée et internée (sys.intern): un argument est son rang dans la table,
+#   retrouvé par dichotomie, sans dictionnaire
+# - les attaques au format CSR dans deux array("i"): les attaquants de l'argument j sont
+#   attaquants[debuts[j]:debuts[j + 1]], soit 4 octets par attaque
+#Les méthodes publiques sont celles de Argumentation. Les vérifications d'un sous ensemble
+#(est_sans_conflit, defends, est_admissible, est_complete, est_stable) travaillent directement sur le
+#CSR; les recherches d'extensions construisent une Argumentation complète le temps de la requête
+#(voir developper). Comme dans Argumentation, une attaque qui mentionne un argument non déclaré est
+#gardée à part (_hors) et ne compte qu'une fois l'argument ajouté par add_argument.
+
+
+class ArgumentationCompacte:
+    __slots__ = ("etiquettes", "_debuts", "_attaquants", "_hors")
+
+    def __init__(self, arguments, attaque):
+        self._remplir(arguments, attaque)
+
+    def _remplir(self, arguments, attaque):
+        self.etiquettes = tuple(sorted(sys.intern(arg) if type(arg) is str else arg for arg in arguments))
+        attaque = set(attaque)
+        paires = sorted({(self._id(cible), self._id(attaquant)) for attaquant, cible in attaque})
+        self._construire([paire for paire in paires if paire[0] >= 0 and paire[1] >= 0])
+        self._hors = tuple(sorted((attaquant, cible) for attaquant, cible in attaque
+                                  if self._id(attaquant) < 0 or self._id(cible) < 0))
+
+    #Construit le CSR à partir des paires (cible, attaquant) triées
+    def _construire(self, paires):
+        debuts, attaquants = array("i", bytes(4 * (len(self.etiquettes) + 1))), array("i")
+        for cible, attaquant in paires:
+            debuts[cible + 1] += 1
+            attaquants.append(attaquant)
+        for j in range(len(self.etiquettes)):
+            debuts[j + 1] += debuts[j]
+        self._debuts, self._attaquants = debuts, attaquants
+
+    #Chargement direct depuis un fichier (voir formats.py), sans passer par une Argumentation
+    @staticmethod
+    def fichier_vers_arg(chemin, format=None):
+        from formats import lire
+        etiquettes, declares, (attaquants, cibles) = lire(chemin, format)
+        af = ArgumentationCompacte.__new__(ArgumentationCompacte)
+        af.etiquettes = tuple(sorted(sys.intern(etiquettes[i]) for i in set(declares)))
+        rangs = [af._id(etiquette) for etiquette in etiquettes]
+        af._construire(sorted({(rangs[j], rangs[i]) for i, j in zip(attaquants, cibles)
+                               if rangs[i] >= 0 and rangs[j] >= 0}))
+        af._hors = tuple(sorted({(etiquettes[i], etiquettes[j]) for i, j in zip(attaquants, cibles)
+                                 if rangs[i] < 0 or rangs[j] < 0}))
+        return af
+
+    @staticmethod
+    def depuis(af):
+        return ArgumentationCompacte(af.arguments, af.attaque)
+
+    #Argumentation complète équivalente, pour les recherches d'extensions
+    def developper(self):
+        return Argumentation(set(self.etiquettes), self.attaque, self.etiquettes)
+
+    #Rang d'une étiquette dans la table, -1 si l'argument n'existe pas
+    def _id(self, arg):
+        i = bisect_left(self.etiquettes, arg)
+        return i if i < len(self.etiquettes) and self.etiquettes[i] == arg else -1
+
+    def _attaquants_de(self, j):
+        return self._attaquants[self._debuts[j]:self._debuts[j + 1]]
+
+    def _ids(self, sousens):
+        return {i for i in map(self._id, sousens) if i >= 0}
+
+    #Mémoire occupée, en octets (les étiquettes internées peuvent être partagées avec d'autres objets)
+    def sizeof(self):
+        rapport = {
+            "objet": sys.getsizeof(self),
+            "etiquettes": sys.getsizeof(self.etiquettes) + sum(sys.getsizeof(arg) for arg in self.etiquettes),
+            "debuts": sys.getsizeof(self._debuts),
+            "attaquants": sys.getsizeof(self._attaquants),
+            "hors": sys.getsizeof(self._hors),
+        }
+        rapport["total"] = sum(rapport.values())
+        return rapport
+
+    #Les mêmes attributs que Argumentation, reconstruits à chaque accès
+    @property
+    def arguments(self):
+        return set(self.etiquettes)
+
+    @property
+    def attaque(self):
+        return {(self.etiquettes[i], self.etiquettes[j])
+                for j in range(len(self.etiquettes)) for i in self._attaquants_de(j)} | set(self._hors)
+
+    @property
+    def attackers_of(self):
+        attaquants = {arg: set() for arg in self.etiquettes}
+        for attaquant, cible in self.attaque:
+            attaquants.setdefault(cible, set()).add(attaquant)
+        return attaquants
+
+    @property
+    def targets_of(self):
+        cibles = {arg: set() for arg in self.etiquettes}
+        for attaquant, cible in self.attaque:
+            cibles.setdefault(attaquant, set()).add(cible)
+        return cibles
+
+    #Les modifications reconstruisent le CSR. Comme dans Argumentation, retirer un argument retire ses
+    #attaques, et add_attack ne déclare pas les arguments qu'elle mentionne
+    def add_argument(self, arg):
+        if self._id(arg) < 0:
+            self._remplir(self.arguments | {arg}, self.attaque)
+
+    def remove_argument(self, arg):
+        if self._id(arg) >= 0:
+            self._remplir(self.arguments - {arg}, {paire for paire in self.attaque if arg not in paire})
+
+    def add_attack(self, attaquant, cible):
+        self._remplir(self.etiquettes, self.attaque | {(attaquant, cible)})
+
+    def remove_attack(self, attaquant, cible):
+        self._remplir(self.etiquettes, self.attaque - {(attaquant, cible)})
+
+    def est_sans_conflit(self, sousens):
+        ids = self._ids(sousens)
+        return not any(i in ids for j in ids for i in self._attaquants_de(j))
+
+    #Tous les attaquants de l'argument doivent être attaqués par un argument du sous ensemble
+    def _defend(self, j, ids):
+        return all(any(k in ids for k in self._attaquants_de(i)) for i in self._attaquants_de(j))
+
+    def defends(self, arg, sousens):
+        j = self._id(arg)
+        return j < 0 or self._defend(j, self._ids(sousens))
+
+    def est_admissible(self, sousens):
+        ids = self._ids(sousens)
+        return self.est_sans_conflit(sousens) and all(self._defend(j, ids) for j in ids)
+
+    def est_complete(self, sousens):
+        if not self.est_admissible(sousens):
+            return False
+        ids = self._ids(sousens)
+        return not any(self._defend(j, ids) for j in range(len(self.etiquettes)) if j not in ids)
+
+    def est_stable(self, sousens):
+        if not self.est_sans_conflit(sousens):
+            return False
+        ids = self._ids(sousens)
+        return all(any(i in ids for i in self._attaquants_de(j)) for j in range(len(self.etiquettes))
+                   if j not in ids)
+
+    #Les recherches se font sur l'Argumentation développée
+    def extensions_complete(self, budget=None):
+        return self.developper().extensions_complete(budget)
+
+    def extensions_stable(self, budget=None):
+        return self.developper().extensions_stable(budget)
+
+    def extensions_preferred(self, budget=None):
+        return self.developper().extensions_preferred(budget)
+
+    def extension_grounded(self):
+        return self.developper().extension_grounded()
+
+    def iter_extensions(self, semantique, moteur="etiquetage", budget=None):
+        return self.developper().iter_extensions(semantique, moteur, budget)
+
+    def compter_extensions(self, semantique, moteur="etiquetage", budget=None):
+        return self.developper().compter_extensions(semantique, moteur, budget)
+
+    def credulous(self, arg, semantique, temoin=False, budget=None):
+        return self.developper().credulous(arg, semantique, temoin, budget)
+
+    def skeptical(self, arg, semantique, temoin=False, budget=None):
+        return self.developper().skeptical(arg, semantique, temoin, budget)
+
+    def simplify(self):
+        return self.developper().simplify()
+
+    def etiquetages(self, stable=False):
+        return self.developper().etiquetages(stable)
+
+    def multi_ensemble(self):
+        return self.developper().multi_ensemble()
@@ -0,0 +1,244 @@
+import mmap
+import os
+import re
+import sys
+from array import array
+
+from argumentation import Argumentation
+from masques import bits
+
+#Chargement rapide des fichiers d'argumentation. Le fichier est projeté en mémoire (mmap) et parcouru
+#par une expression régulière sur les octets, sans découpage ligne par ligne. Les étiquettes sont
+#numérotées pendant la lecture: chaque étiquette n'existe qu'une fois en mémoire et les attaques sont
+#deux colonnes de numéros (array("i"), attaquants et cibles), passées telles quelles à
+#Argumentation.depuis_numeros. Formats reconnus:
+# - apx: arg(A). att(A,B). avec commentaires %, espaces libres et plusieurs énoncés par ligne
+# - tgf (ICCMA): un argument par ligne, une ligne #, puis une attaque "A B" par ligne
+# - i23 (ICCMA 2023): en-tête "p af N", puis une attaque "i j" par ligne, arguments numérotés de 1 à N,
+#   commentaires #
+#Les énoncés mal formés sont signalés avec leurs numéros de ligne (ValueError), ainsi que les attaques
+#qui mentionnent un argument non déclaré (Argumentation les ignorerait).
+#Le format binaire (voir sauvegarder_binaire) est reconnu à sa signature, quelle que soit l'extension.
+
+_APX = re.compile(rb"%[^\n]*|(arg|att)\s*\(\s*([^\s,()%]+)\s*(?:,\s*([^\s,()%]+)\s*)?\)\s*\.")
+_BLANC = re.compile(rb"\s*")
+_LIGNE = re.compile(rb"[^\n]*")
+
+FORMATS = ("apx", "tgf", "i23", "bin")
+#Signature des fichiers binaires
+SIGNATURE = b"AFB1"
+
+
+#Transforme des positions (triées) dans le fichier en numéros de ligne
+def _lignes(contenu, positions):
+    numeros, ligne, debut = [], 1, 0
+    for position in positions:
+        ligne += contenu[debut:position].count(b"\n")
+        debut = position
+        numeros.append(ligne)
+    return numeros
+
+
+def _erreur(chemin, contenu, positions):
+    lignes = ", ".join(str(ligne) for ligne in _lignes(contenu, positions))
+    return ValueError(f"{chemin}: énoncés mal formés aux lignes {lignes}")
+
+
+#Devine le format d'après l'extension du fichier, puis d'après son contenu
+def detecter_format(chemin, contenu):
+    if contenu[:4] == SIGNATURE:
+        return "bin"
+    extension = os.path.splitext(chemin)[1].lower().lstrip(".")
+    if extension in FORMATS:
+        return extension
+    debut = contenu[:4096].lstrip()
+    if debut.startswith(b"p af"):
+        return "i23"
+    if re.match(rb"(%[^\n]*\s*)*(arg|att)\s*\(", debut) or not debut:
+        return "apx"
+    return "tgf"
+
+
+class _Interneur:
+    def __init__(self):
+        self.ids = {}
+        self.etiquettes = []
+
+    def id(self, etiquette):
+        numero = self.ids.get(etiquette)
+        if numero is None:
+            numero = self.ids[etiquette] = len(self.etiquettes)
+            self.etiquettes.append(etiquette.decode())
+        return numero
+
+
+def _lire_apx(chemin, contenu):
+    interneur, declares, attaquants, cibles, erreurs = _Interneur(), [], array("i"), array("i"), []
+    fin = 0
+    for enonce in _APX.finditer(contenu):
+        #Entre deux énoncés il ne doit y avoir que des blancs
+        if _BLANC.fullmatch(contenu, fin, enonce.start()) is None:
+            erreurs.append(_BLANC.match(contenu, fin).end())
+        fin = enonce.end()
+        genre, premier, second = enonce.groups()
+        if genre is None:
+            continue
+        if (genre == b"arg") != (second is None):
+            erreurs.append(enonce.start())
+        elif genre == b"arg":
+            declares.append(interneur.id(premier))
+        else:
+            attaquants.append(interneur.id(premier))
+            cibles.append(interneur.id(second))
+    if _BLANC.fullmatch(contenu, fin, len(contenu)) is None:
+        erreurs.append(_BLANC.match(contenu, fin).end())
+    #Les arguments peuvent être déclarés après leurs attaques: on ne vérifie les attaques qu'à la fin,
+    #et on ne cherche leurs positions (deuxième parcours) que s'il en manque
+    manquants = set(attaquants).union(cibles).difference(declares)
+    if manquants:
+        attaques = (enonce for enonce in _APX.finditer(contenu)
+                    if enonce.group(1) == b"att" and enonce.group(3) is not None)
+        erreurs.extend(enonce.start() for enonce, i, j in zip(attaques, attaquants, cibles)
+                       if i in manquants or j in manquants)
+    if erreurs:
+        raise _erreur(chemin, contenu, sorted(erreurs))
+    return interneur.etiquettes, declares, (attaquants, cibles)
+
+
+def _lire_tgf(chemin, contenu):
+    interneur, declares, attaquants, cibles, erreurs = _Interneur(), [], array("i"), array("i"), []
+    dans_attaques = False
+    for ligne in _LIGNE.finditer(contenu):
+        mots = ligne.group().split()
+        if not mots:
+            continue
+        if mots == [b"#"]:
+            dans_attaques = True
+        elif not dans_attaques and len(mots) == 1:
+            declares.append(interneur.id(mots[0]))
+        elif dans_attaques and len(mots) == 2 and mots[0] in interneur.ids and mots[1] in interneur.ids:
+            #Les arguments sont tous déclarés avant la ligne #
+            attaquants.append(interneur.id(mots[0]))
+            cibles.append(interneur.id(mots[1]))
+        else:
+            erreurs.append(ligne.start())
+    if erreurs:
+        raise _erreur(chemin, contenu, erreurs)
+    return interneur.etiquettes, declares, (attaquants, cibles)
+
+
+def _lire_i23(chemin, contenu):
+    nombre, attaquants, cibles, erreurs = None, array("i"), array("i"), []
+    for ligne in _LIGNE.finditer(contenu):
+        mots = ligne.group().split()
+        if not mots or mots[0].startswith(b"#"):
+            continue
+        if nombre is None:
+            if len(mots) == 3 and mots[:2] == [b"p", b"af"] and mots[2].isdigit():
+                nombre = int(mots[2])
+            else:
+                erreurs.append(ligne.start())
+            continue
+        if len(mots) == 2 and mots[0].isdigit() and mots[1].isdigit() \
+                and 1 <= int(mots[0]) <= nombre and 1 <= int(mots[1]) <= nombre:
+            attaquants.append(int(mots[0]) - 1)
+            cibles.append(int(mots[1]) - 1)
+        else:
+            erreurs.append(ligne.start())
+    if nombre is None and not erreurs:
+        erreurs.append(0)
+    if erreurs:
+        raise _erreur(chemin, contenu, erreurs)
+    return [str(i) for i in range(1, nombre + 1)], range(nombre), (attaquants, cibles)
+
+
+#Format binaire compact, entiers de 32 bits petit boutistes:
+# - signature AFB1, nombre d'arguments n, nombre d'attaques m, taille de la table des étiquettes
+# - n + 1 positions des étiquettes dans la table
+# - n + 1 débuts de ligne puis m cibles: les attaques au format CSR, les cibles de l'argument i sont
+#   cibles[debuts[i]:debuts[i + 1]]
+# - la table des étiquettes en UTF-8
+#Au chargement, les tableaux sont copiés d'un bloc depuis la projection mémoire du fichier dans des
+#array("i"), sans paires ni objets Python par attaque.
+def sauvegarder_binaire(af, chemin):
+    etiquettes = [str(etiquette).encode() for etiquette in af.etiquettes]
+    positions, debuts, cibles = array("i", [0]), array("i", [0]), array("i")
+    for etiquette in etiquettes:
+        positions.append(positions[-1] + len(etiquette))
+    for masque in af.masque_cibles:
+        cibles.extend(bits(masque))
+        debuts.append(len(cibles))
+    if sys.byteorder != "little":
+        for tableau in (positions, debuts, cibles):
+            tableau.byteswap()
+    with open(chemin, "wb") as fichier:
+        entete = array("i", [len(etiquettes), len(cibles), positions[-1] if etiquettes else 0])
+        if sys.byteorder != "little":
+            entete.byteswap()
+        fichier.write(SIGNATURE + entete.tobytes())
+        fichier.write(positions.tobytes() + debuts.tobytes() + cibles.tobytes())
+        fichier.write(b"".join(etiquettes))
+
+
+#Entiers de 32 bits petit boutistes, copiés dans un array("i")
+def _entiers(octets):
+    tableau = array("i")
+    tableau.frombytes(octets)
+    if sys.byteorder != "little":
+        tableau.byteswap()
+    return tableau
+
+
+#Seule la vue vue reste ouverte sur la projection, et elle est libérée par le with même en cas
+#d'erreur: la projection peut ensuite être fermée
+def _lire_bin(chemin, contenu):
+    with memoryview(contenu) as vue:
+        if len(vue) < 16 or vue[:4] != SIGNATURE:
+            raise ValueError(f"{chemin}: fichier binaire invalide")
+        n, m, taille = _entiers(vue[4:16])
+        debut = 16 + 4 * (n + 1)
+        fin = debut + 4 * (n + 1 + m)
+        if min(n, m, taille) < 0 or len(vue) != fin + taille:
+            raise ValueError(f"{chemin}: fichier binaire tronqué")
+        positions, debuts = _entiers(vue[16:debut]), _entiers(vue[debut:debut + 4 * (n + 1)])
+        cibles = _entiers(vue[debut + 4 * (n + 1):fin])
+        table = bytes(vue[fin:])
+    #Contenu incohérent: les tableaux de débuts doivent croître de 0 jusqu'à leur total, et les cibles
+    #être des numéros d'arguments
+    for tableau, total in ((positions, taille), (debuts, m)):
+        if tableau[0] != 0 or tableau[n] != total or any(a > b for a, b in zip(tableau, tableau[1:])):
+            raise ValueError(f"{chemin}: fichier binaire corrompu")
+    if m and (min(cibles) < 0 or max(cibles) >= n):
+        raise ValueError(f"{chemin}: fichier binaire corrompu")
+    etiquettes = [table[positions[i]:positions[i + 1]].decode() for i in range(n)]
+    #Colonne des attaquants: l'argument i répété autant de fois qu'il a de cibles
+    attaquants = array("i")
+    for i in range(n):
+        attaquants.extend(array("i", [i]) * (debuts[i + 1] - debuts[i]))
+    return etiquettes, range(n), (attaquants, cibles)
+
+
+_LECTEURS = {"apx": _lire_apx, "tgf": _lire_tgf, "i23": _lire_i23, "bin": _lire_bin}
+
+
+#Lit un fichier d'argumentation (format deviné si format vaut None) et renvoie la table des
+#étiquettes, les numéros des arguments déclarés et les attaques (colonnes attaquants, cibles)
+def lire(chemin, format=None):
+    with open(chemin, "rb") as fichier:
+        taille = os.fstat(fichier.fileno()).st_size
+        contenu = mmap.mmap(fichier.fileno(), 0, access=mmap.ACCESS_READ) if taille else b""
+        try:
+            format = format or detecter_format(chemin, contenu)
+            if format not in _LECTEURS:
+                raise ValueError(f"Format inconnu: {format}")
+            etiquettes, declares, attaques = _LECTEURS[format](chemin, contenu)
+        finally:
+            if taille:
+                contenu.close()
+    return etiquettes, declares, attaques
+
+
+#Charge un fichier d'argumentation (format deviné si format vaut None)
+def charger(chemin, format=None):
+    etiquettes, declares, (attaquants, cibles) = lire(chemin, format)
+    return Argumentation.depuis_numeros(etiquettes, attaquants, cibles, declares)
@@ -0,0 +1,20 @@
+#Un sous ensemble d'arguments est un masque: l'argument numéro i est le bit i d'un entier Python.
+#Ces deux fonctions passent d'une liste de numéros à un masque et inversement.
+
+
+#Cette fonction construit le masque d'une liste de numéros
+def masque_de(numeros):
+    if not numeros:
+        return 0
+    octets = bytearray((max(numeros) >> 3) + 1)
+    for i in numeros:
+        octets[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(octets, "little")
+
+
+#Cette fonction renvoie les numéros des bits à 1 d'un masque
+def bits(masque):
+    while masque:
+        bit = masque & -masque
+        yield bit.bit_length() - 1
+        masque ^= bit
@@ -0,0 +1,108 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from argumentation import Argumentation
+from budget import Budget, BudgetDepasse
+from masques import bits
+
+#Énumération parallèle des extensions complètes et stables sur plusieurs processus.
+#On découpe l'arbre de recherche en fixant les étiquettes des premiers arguments (les plus attaqués):
+#chaque préfixe cohérent devient une tâche, et deux préfixes différents donnent des extensions
+#différentes, il suffit donc de réunir les résultats des processus.
+
+#Argumentation et budget du processus de travail, reconstruits une seule fois par l'initialiseur
+_AF = None
+_BUDGET = None
+
+
+#L'argumentation est envoyée aux processus une seule fois, sous forme compacte: la table des
+#étiquettes et les attaques en numéros. Les tâches ne contiennent ensuite que trois masques.
+#Chaque processus reçoit aussi l'échéance et la limite de mémoire du budget éventuel, et un événement
+#d'annulation: levé par le processus principal, il arrête les tâches en cours.
+def _initialiser(etiquettes, attaques, limites, annulation):
+    global _AF, _BUDGET
+    _AF = Argumentation(set(etiquettes), {(etiquettes[i], etiquettes[j]) for i, j in attaques}, etiquettes)
+    echeance, max_memoire = limites if limites is not None else (None, None)
+    _BUDGET = Budget(echeance=echeance, max_memoire=max_memoire, annulation=annulation)
+
+
+#Renvoie les masques trouvés et, si le budget est dépassé, la raison de l'arrêt
+def _resoudre(stable, impose):
+    trouves = []
+    try:
+        for masque in _AF._iter_masques(stable, impose, _BUDGET):
+            trouves.append(masque)
+    except BudgetDepasse as depassement:
+        return trouves, depassement.raison
+    return trouves, None
+
+
+#Découpe la recherche en au moins nombre préfixes (si l'argumentation le permet): on développe
+#l'arbre de recherche en largeur, comme le ferait le moteur d'étiquetage, jusqu'à avoir assez de branches
+def prefixes(af, stable, nombre):
+    g_in, g_out = af._grounded()
+    depart = af._propager((g_in, g_out, 0), af._tous, stable)
+    if depart is None:
+        return []
+    ordre = sorted(range(len(af.etiquettes)), key=lambda i: (-af.masque_attaquants[i].bit_count(), i))
+    branches = [depart]
+    while len(branches) < nombre:
+        suivantes = []
+        for m_in, m_out, m_undec in branches:
+            libres = af._tous & ~(m_in | m_out | m_undec)
+            if not libres:
+                suivantes.append((m_in, m_out, m_undec))
+                continue
+            i = next(i for i in ordre if libres >> i & 1)
+            bit = 1 << i
+            voisins = bit | af.masque_attaquants[i] | af.masque_cibles[i]
+            essais = [(m_in | bit, m_out, m_undec), (m_in, m_out | bit, m_undec)]
+            if not stable:
+                essais.append((m_in, m_out, m_undec | bit))
+            for essai in essais:
+                etat = af._propager(essai, voisins, stable)
+                if etat is not None:
+                    suivantes.append(etat)
+        if suivantes == branches:
+            break
+        branches = suivantes
+    return branches
+
+
+#Produit les extensions ("CO" ou "ST") calculées par jobs processus, au fur et à mesure que les
+#tâches se terminent. Quand le budget est dépassé ou annulé, les tâches en cours s'arrêtent, les
+#autres sont abandonnées et BudgetDepasse est levée après les extensions des tâches déjà terminées
+def iter_extensions_parallele(af, semantique, jobs, budget=None):
+    stable = semantique == "ST"
+    noyau, fixes, _ = af.simplify()
+    attaques = [(i, j) for j, masque in enumerate(noyau.masque_attaquants) for i in bits(masque)]
+    taches = prefixes(noyau, stable, 4 * jobs)
+    limites = (budget.echeance, budget.max_memoire) if budget is not None else None
+    #Budget.annuler() lève l'événement dans les processus de travail
+    annulation = budget.signal() if budget is not None else multiprocessing.Event()
+    raison = None
+    executeur = ProcessPoolExecutor(max_workers=jobs, initializer=_initialiser,
+                                    initargs=(noyau.etiquettes, attaques, limites, annulation))
+    try:
+        futurs = [executeur.submit(_resoudre, stable, impose) for impose in taches]
+        for futur in as_completed(futurs):
+            masques, raison_tache = futur.result()
+            for masque in masques:
+                yield fixes | noyau._vers_ensemble(masque)
+            raison = raison_tache
+            if raison is None and budget is not None:
+                try:
+                    budget.verifier_maintenant()
+                except BudgetDepasse as depassement:
+                    raison = depassement.raison
+            if raison is not None:
+                break
+    finally:
+        #Si l'appelant s'arrête avant la fin ou si le budget est dépassé, les tâches en cours
+        #s'arrêtent à leur prochaine vérification et celles pas encore commencées sont abandonnées
+        annulation.set()
+        executeur.shutdown(wait=True, cancel_futures=True)
+        if budget is not None:
+            budget.oublier(annulation)
+    if raison is not None:
+        raise BudgetDepasse(raison)
@@ -0,0 +1,102 @@
+import json
+import sys
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager, nullcontext
+
+#Instrumentation des chemins chauds: compteurs et chronomètres par phase. Désactivée par défaut.
+#Les fonctions mesurées (Argumentation.fichier_vers_arg et _simplifier, chronométrées, et
+#FonctionCaracteristique.ajouter et retirer, seulement comptées: un chronomètre coûterait plus qu'un
+#pas en O(deg)) ne sont remplacées par des versions instrumentées que par activer(): désactivée,
+#l'instrumentation ne change donc pas le code exécuté. Dans les boucles de recherche, le profil actif
+#est lu une fois au départ et chaque noeud ne coûte qu'un test à None quand il n'y en a pas.
+#Les processus de --jobs ne sont pas comptés: seul le processus principal est instrumenté.
+
+#Profil en cours, None si l'instrumentation est désactivée
+ACTIF = None
+#Les fonctions d'origine, par (classe, nom), remises en place par desactiver()
+_ORIGINES = {}
+
+
+class Profil:
+    def __init__(self):
+        self.compteurs = Counter()
+        #Temps cumulé de chaque phase, en secondes
+        self.temps = defaultdict(float)
+
+    @contextmanager
+    def phase(self, nom):
+        debut = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.temps[nom] += time.perf_counter() - debut
+
+    def rapport(self):
+        return {"temps": {nom: round(duree, 6) for nom, duree in sorted(self.temps.items())},
+                "compteurs": dict(sorted(self.compteurs.items()))}
+
+    #Le rapport va sur la sortie d'erreur ("-") ou dans un fichier JSON, jamais sur la sortie standard
+    def ecrire(self, destination):
+        if destination == "-":
+            rapport = self.rapport()
+            for nom, duree in rapport["temps"].items():
+                print(f"profil: {nom}: {duree:.6f} s", file=sys.stderr)
+            for nom, nombre in rapport["compteurs"].items():
+                print(f"profil: {nom}: {nombre}", file=sys.stderr)
+        else:
+            with open(destination, "w") as fichier:
+                json.dump(self.rapport(), fichier, indent=1)
+                fichier.write("\n")
+
+
+def compter(nom, nombre=1):
+    if ACTIF is not None:
+        ACTIF.compteurs[nom] += nombre
+
+
+def phase(nom):
+    return ACTIF.phase(nom) if ACTIF is not None else nullcontext()
+
+
+#Version chronométrée d'une fonction, qui compte aussi ses appels
+def _chronometrer(fonction, nom):
+    def instrumentee(*args, **kwargs):
+        ACTIF.compteurs[nom] += 1
+        with ACTIF.phase(nom):
+            return fonction(*args, **kwargs)
+    return instrumentee
+
+
+#Version d'une fonction qui compte seulement ses appels
+def _compter(fonction, nom):
+    def instrumentee(*args, **kwargs):
+        ACTIF.compteurs[nom] += 1
+        return fonction(*args, **kwargs)
+    return instrumentee
+
+
+def activer():
+    global ACTIF
+    from argumentation import Argumentation
+    from caracteristique import FonctionCaracteristique
+    ACTIF = Profil()
+    if not _ORIGINES:
+        remplacements = (
+            (Argumentation, "fichier_vers_arg", _chronometrer, "chargement"),
+            (Argumentation, "_simplifier", _chronometrer, "simplification"),
+            (FonctionCaracteristique, "ajouter", _compter, "caracteristique_ajouts"),
+            (FonctionCaracteristique, "retirer", _compter, "caracteristique_retraits"),
+        )
+        for classe, nom, instrumenter, compteur in remplacements:
+            _ORIGINES[classe, nom] = classe.__dict__[nom]
+            setattr(classe, nom, instrumenter(_ORIGINES[classe, nom], compteur))
+    return ACTIF
+
+
+def desactiver():
+    global ACTIF
+    for (classe, nom), fonction in _ORIGINES.items():
+        setattr(classe, nom, fonction)
+    _ORIGINES.clear()
+    ACTIF = None
@@ -1,37 +1,280 @@
-import argparse
-from argumentation import Argumentation
-
-def main():
-    #Ici on parse les commandes pour les traiter en fonction de leurs arguments et options (SE-XX, ST-XX..)
-    parser = argparse.ArgumentParser(description="Argumentation Solveur")
-    parser.add_argument("-p", required=True)
-    parser.add_argument("-f", required=True)
-    parser.add_argument("-a", default=None)
-    
-    args = parser.parse_args()
-
-    # On crée l'argumentation grâce à la fonction fichier_vers_arg
-    af = Argumentation.fichier_vers_arg(args.f)
-
-    # Ensuite en fonction des options on renvoie la sortie correspondante
-    if args.p == "SE-CO":
-        #Ici les extensions complètes
-        print(sorted([sorted(ext) for ext in af.extensions_complete()]))
-        #Ici les extensions stables
-    elif args.p == "SE-ST":
-        print(sorted([sorted(ext) for ext in af.extensions_stable()]))
-    #Ici les DC et DS avec argument
-    elif args.p.startswith("DC") or args.p.startswith("DS"):
-        if not args.a:
-            print("L'argument -a est requit")
-            return
-        argument = args.a
-        extension_type = af.extensions_complete if "CO" in args.p else af.extensions_stable
-        verification = any if "DC" in args.p else all
-        print("YES" if verification(argument in ext for ext in extension_type()) else "NO")
-
-    else:
-        print(f"Problème inconnu: {args.p}")
-
-if __name__ == "__main__":
-    main()
+import sys
+
+#Client léger: avec --connect la requête part directement au démon (voir client.py), avant les
+#imports du solveur qui ne servent qu'au calcul local
+if __name__ == "__main__" and any(option == "--connect" or option.startswith("--connect=")
+                                  for option in sys.argv[1:]):
+    import client
+    sys.exit(client.main(sys.argv[1:]))
+
+import argparse
+import importlib.util
+import shlex
+from itertools import islice
+from argumentation import Argumentation, MOTEURS, SEMANTIQUES
+from budget import Budget, BudgetDepasse
+from cache import CacheResultats, DOSSIER_PAR_DEFAUT, TAILLE_PAR_DEFAUT
+from client import CODE_INCOMPLET, MARQUEUR_INCOMPLET
+from formats import sauvegarder_binaire
+from parallele import iter_extensions_parallele
+import profil
+
+#Quand le budget de temps ou de mémoire est dépassé, la sortie partielle est suivie du marqueur
+#MARQUEUR_INCOMPLET et le programme se termine avec le code CODE_INCOMPLET (voir client.py)
+
+#Entier positif ou nul pour --limit
+def _positif(valeur):
+    try:
+        nombre = int(valeur)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"entier attendu: {valeur}")
+    if nombre < 0:
+        raise argparse.ArgumentTypeError(f"doit être positif ou nul: {valeur}")
+    return nombre
+
+#Ici on parse les commandes pour les traiter en fonction de leurs arguments et options (SE-XX, ST-XX..)
+def creer_parser():
+    parser = argparse.ArgumentParser(description="Argumentation Solveur")
+    parser.add_argument("-p")
+    parser.add_argument("-f")
+    parser.add_argument("-a", default=None)
+    #Le moteur numpy est optionnel: il nécessite le paquet numpy (pip install numpy)
+    parser.add_argument("--engine", choices=MOTEURS, default="etiquetage")
+    parser.add_argument("--jobs", type=int, default=1)
+    #SE-XX: on s'arrête après les K premières extensions trouvées
+    parser.add_argument("--limit", type=_positif, default=None)
+    #Mode lot: une requête par ligne (par exemple "-p DC-CO -a A"), "-" pour l'entrée standard
+    parser.add_argument("--batch", default=None)
+    #Cache disque des extensions (dossier optionnel, ~/.cache/argumentation par défaut)
+    parser.add_argument("--cache", nargs="?", const=DOSSIER_PAR_DEFAUT, default=None)
+    parser.add_argument("--cache-size", type=float, default=TAILLE_PAR_DEFAUT // (1024 * 1024), help="en Mo")
+    parser.add_argument("--cache-stats", action="store_true")
+    #Envoie la requête à un démon lancé avec "project.py serve" (socket Unix ou hote:port)
+    parser.add_argument("--connect", default=None)
+    #Enregistre l'argumentation de -f au format binaire (voir formats.py), relu directement par -f
+    parser.add_argument("--save-binary", default=None)
+    #Budgets: on s'arrête proprement avec les extensions déjà trouvées (voir budget.py)
+    parser.add_argument("--timeout", type=float, default=None, help="en secondes")
+    parser.add_argument("--max-memory", type=int, default=None, help="en Mo")
+    #Temps des phases et compteurs de la recherche (voir profil.py), sur la sortie d'erreur ou dans
+    #un fichier JSON; la sortie standard ne change pas
+    parser.add_argument("--profile", nargs="?", const="-", default=None)
+    return parser
+
+#Budget correspondant aux options --timeout et --max-memory (None sans limite)
+def creer_budget(args):
+    if args.timeout is None and args.max_memory is None:
+        return None
+    return Budget(args.timeout, args.max_memory * 1024 * 1024 if args.max_memory is not None else None)
+
+#Liste les extensions; si le budget est dépassé, celles déjà trouvées sont attachées à l'exception
+def _collecter(extensions):
+    trouvees = []
+    try:
+        for extension in extensions:
+            trouvees.append(extension)
+    except BudgetDepasse as depassement:
+        if depassement.partiel is None:
+            depassement.partiel = trouvees
+        raise
+    return trouvees
+
+#Cette fonction renvoie la sortie d'une requête sur une argumentation déjà chargée.
+#Si memo est un dictionnaire, les extensions de chaque sémantique y sont calculées une seule fois
+#et toutes les requêtes suivantes (SE, DC, DS) sont résolues à partir de ce résultat partagé.
+#Avec un cache disque, les extensions déjà calculées lors d'une exécution précédente y sont relues.
+#Avec limite, les problèmes SE-XX s'arrêtent après les limite premières extensions trouvées.
+#Si le budget est dépassé, BudgetDepasse est levée avec la sortie partielle (attribut sortie).
+def repondre(af, probleme, argument=None, moteur="etiquetage", jobs=1, memo=None, cache=None, limite=None,
+             budget=None):
+    #Avec jobs > 1 les extensions sont calculées par plusieurs processus
+    def parallele(semantique):
+        return jobs > 1 and moteur == "etiquetage" and semantique in ("CO", "ST")
+
+    def calculer(semantique):
+        if parallele(semantique):
+            return iter_extensions_parallele(af, semantique, jobs, budget)
+        return af.iter_extensions(semantique, moteur, budget)
+
+    def depuis_cache(semantique):
+        if cache is None:
+            return calculer(semantique)
+        resultat = cache.lire(af, semantique)
+        profil.compter("cache_misses" if resultat is None else "cache_hits")
+        if resultat is None:
+            resultat = _collecter(calculer(semantique))
+            cache.ecrire(af, semantique, resultat)
+        return resultat
+
+    def extensions(semantique):
+        if memo is None:
+            return depuis_cache(semantique)
+        if semantique not in memo:
+            memo[semantique] = _collecter(depuis_cache(semantique))
+        else:
+            profil.compter("memo_hits")
+        return memo[semantique]
+
+    #Les premières extensions seulement: on ne calcule pas (et on ne met pas en cache) les suivantes
+    def premieres(semantique):
+        if limite is None or memo is not None and semantique in memo:
+            return islice(extensions(semantique), limite)
+        resultat = cache.lire(af, semantique) if cache is not None else None
+        return islice(calculer(semantique) if resultat is None else resultat, limite)
+
+    #Les extensions sont produites dans le try: un dépassement du budget pendant le calcul, le passage
+    #par le cache ou le memo garde ainsi les extensions déjà trouvées dans la sortie partielle
+    def formater(semantique):
+        try:
+            trouvees = _collecter(premieres(semantique))
+        except BudgetDepasse as depassement:
+            partiel = list(depassement.partiel or [])
+            depassement.sortie = str(sorted([sorted(ext) for ext in partiel[:limite]]))
+            raise
+        return str(sorted([sorted(ext) for ext in trouvees]))
+
+    # En fonction des options on renvoie la sortie correspondante
+    if probleme == "SE-CO":
+        #Ici les extensions complètes
+        return formater("CO")
+        #Ici les extensions stables
+    elif probleme == "SE-ST":
+        return formater("ST")
+        #Ici les extensions préférées
+    elif probleme == "SE-PR":
+        return formater("PR")
+        #Ici l'extension fondée, qui est unique
+    elif probleme == "SE-GR":
+        return str(sorted(af.extension_grounded()))
+    #Ici le nombre d'extensions, sans construire la liste quand rien n'est déjà calculé
+    elif probleme.startswith("CE-"):
+        semantique = probleme[3:]
+        if semantique not in SEMANTIQUES:
+            return f"Problème inconnu: {probleme}"
+        try:
+            if memo is None and cache is None and not parallele(semantique):
+                return str(af.compter_extensions(semantique, moteur, budget))
+            return str(len(_collecter(extensions(semantique))))
+        except BudgetDepasse as depassement:
+            #Le nombre d'extensions déjà comptées
+            partiel = depassement.partiel
+            depassement.sortie = str(partiel if isinstance(partiel, int) else len(partiel))
+            raise
+    #Ici les DC et DS avec argument
+    elif probleme.startswith("DC") or probleme.startswith("DS"):
+        if not argument:
+            return "L'argument -a est requit"
+        semantique = probleme[3:]
+        if semantique not in SEMANTIQUES:
+            return f"Problème inconnu: {probleme}"
+        #La recherche s'arrête dès que la réponse est connue
+        if moteur == "etiquetage" and memo is None and cache is None:
+            verification = af.credulous if probleme.startswith("DC") else af.skeptical
+            return "YES" if verification(argument, semantique, budget=budget) else "NO"
+        #Sinon les extensions arrivent une par une (ou sont déjà calculées), any/all s'arrêtent aussi tôt
+        verification = any if probleme.startswith("DC") else all
+        return "YES" if verification(argument in ext for ext in extensions(semantique)) else "NO"
+    return f"Problème inconnu: {probleme}"
+
+#Mode lot: chaque fichier est chargé une seule fois et les extensions de chaque sémantique sont
+#partagées entre toutes les requêtes qui portent sur ce fichier
+def traiter_lot(parser, args, cache=None, budget=None):
+    chargees = {}
+    lignes = sys.stdin if args.batch == "-" else open(args.batch, 'r')
+    with lignes:
+        for ligne in lignes:
+            ligne = ligne.strip()
+            if not ligne or ligne.startswith("#"):
+                continue
+            #Chaque ligne reçoit une ligne de réponse: une requête fautive donne une ligne d'erreur,
+            #comme dans serveur.py, et le lot continue
+            print(repondre_ligne(parser, args, ligne, chargees, cache, budget))
+
+#Réponse à une ligne du lot; seul le dépassement du budget, qui porte sur tout le lot, l'interrompt
+def repondre_ligne(parser, args, ligne, chargees, cache=None, budget=None):
+    try:
+        #argparse signale une option inconnue sur la sortie d'erreur puis lève SystemExit
+        requete = parser.parse_args(shlex.split(ligne), namespace=argparse.Namespace(**vars(args)))
+    except (SystemExit, ValueError):
+        return f"Requête invalide: {ligne}"
+    if not requete.p or not requete.f:
+        return "Les arguments -p et -f sont requis"
+    if requete.f not in chargees:
+        try:
+            chargees[requete.f] = (Argumentation.fichier_vers_arg(requete.f), {})
+        except (OSError, ValueError) as erreur:
+            return f"Fichier illisible: {erreur}"
+    af, memo = chargees[requete.f]
+    try:
+        return repondre(af, requete.p, requete.a, requete.engine, requete.jobs, memo, cache, requete.limit, budget)
+    except BudgetDepasse:
+        raise
+    except Exception as erreur:
+        return f"Erreur: {erreur}"
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    #"project.py serve ..." lance le démon, voir serveur.py
+    if argv[:1] == ["serve"]:
+        import serveur
+        serveur.main(argv[1:])
+        return
+    parser = creer_parser()
+    args = parser.parse_args(argv)
+    if args.save_binary and args.f and not args.batch:
+        sauvegarder_binaire(Argumentation.fichier_vers_arg(args.f), args.save_binary)
+        if not args.p:
+            return
+    if not args.batch and (not args.p or not args.f):
+        parser.error("les arguments -p et -f sont requis")
+    if args.connect:
+        import client
+        code = client.main(argv)
+        if code:
+            sys.exit(code)
+        return
+    #Sans numpy, le moteur numpy est refusé avant tout calcul (le démon de --connect a peut être numpy).
+    #find_spec cherche le paquet sans l'importer
+    if args.engine == "numpy" and importlib.util.find_spec("numpy") is None:
+        parser.error("le moteur numpy nécessite le paquet numpy (pip install numpy)")
+    cache = CacheResultats(args.cache, args.cache_size * 1024 * 1024) if args.cache else None
+    #Le budget porte sur toute l'exécution, y compris sur toutes les requêtes d'un lot
+    budget = creer_budget(args)
+    if args.profile:
+        profil.activer()
+    try:
+        if args.batch:
+            with profil.phase("total"):
+                traiter_lot(parser, args, cache, budget)
+        else:
+            # On crée l'argumentation grâce à la fonction fichier_vers_arg
+            try:
+                af = Argumentation.fichier_vers_arg(args.f)
+            except (OSError, ValueError) as erreur:
+                #Fichier absent ou mal formé (formats.py donne les numéros des lignes fautives)
+                print(f"Fichier illisible: {erreur}", file=sys.stderr)
+                sys.exit(2)
+            with profil.phase("recherche"):
+                sortie = repondre(af, args.p, args.a, args.engine, args.jobs, cache=cache, limite=args.limit,
+                                  budget=budget)
+            print(sortie)
+        #Les statistiques du cache vont sur la sortie d'erreur pour ne pas changer la sortie
+        if cache is not None and args.cache_stats:
+            print(cache.statistiques(), file=sys.stderr)
+    except BudgetDepasse as depassement:
+        #Les extensions trouvées avant l'arrêt, puis le marqueur de résultat incomplet
+        if depassement.sortie is not None:
+            print(depassement.sortie)
+        print(MARQUEUR_INCOMPLET)
+        print(f"Résultat incomplet: {depassement.raison}", file=sys.stderr)
+        sys.exit(CODE_INCOMPLET)
+    finally:
+        if cache is not None:
+            cache.fermer()
+        if args.profile:
+            profil.ACTIF.ecrire(args.profile)
+            profil.desactiver()
+
+if __name__ == "__main__":
+    main()
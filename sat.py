@@ -0,0 +1,261 @@
+import heapq
+
+#Solveur SAT par apprentissage de clauses (CDCL), écrit en Python pur pour ne dépendre de rien.
+#Un littéral est un entier non nul: v pour "la variable v est vraie", -v pour "la variable v est fausse".
+#On y retrouve les éléments habituels des solveurs de compétition: deux littéraux surveillés par
+#clause pour la propagation unitaire, analyse de conflit au premier point d'implication unique (1UIP),
+#retour non chronologique, heuristique d'activité (VSIDS), mémorisation des phases et redémarrages.
+class SolveurCDCL:
+    def __init__(self):
+        self.nb_variables = 0
+        #Pour chaque variable (la case 0 n'est pas utilisée)
+        self.valeurs = [None]
+        self.niveaux = [0]
+        self.raisons = [None]
+        self.activites = [0.0]
+        self.phases = [False]
+        #Pour chaque littéral, les clauses qui le surveillent (voir _indice)
+        self.surveillees = [[], []]
+        self.trace = []
+        self.limites = []
+        self.tete = 0
+        self.tas = []
+        self.increment = 1.0
+        self.incoherent = False
+        self.modele = None
+
+    #Position d'un littéral dans la liste des clauses surveillées
+    @staticmethod
+    def _indice(lit):
+        return 2 * lit if lit > 0 else -2 * lit + 1
+
+    def nouvelle_variable(self):
+        self.nb_variables += 1
+        self.valeurs.append(None)
+        self.niveaux.append(0)
+        self.raisons.append(None)
+        self.activites.append(0.0)
+        self.phases.append(False)
+        self.surveillees.extend(([], []))
+        heapq.heappush(self.tas, (0.0, self.nb_variables))
+        return self.nb_variables
+
+    def _valeur(self, lit):
+        valeur = self.valeurs[abs(lit)]
+        if valeur is None:
+            return None
+        return valeur if lit > 0 else not valeur
+
+    def _affecter(self, lit, raison):
+        variable = abs(lit)
+        self.valeurs[variable] = lit > 0
+        self.niveaux[variable] = len(self.limites)
+        self.raisons[variable] = raison
+        self.trace.append(lit)
+
+    def _attacher(self, clause):
+        self.surveillees[self._indice(clause[0])].append(clause)
+        self.surveillees[self._indice(clause[1])].append(clause)
+
+    #Ajoute une clause (liste de littéraux). Renvoie False si le problème devient insatisfiable.
+    #Le solveur revient au niveau 0 avant l'ajout, on peut donc ajouter des clauses entre deux appels
+    #à resoudre(), par exemple pour bloquer un modèle déjà trouvé.
+    def ajouter_clause(self, clause):
+        if self.incoherent:
+            return False
+        self._revenir(0)
+        while max((abs(lit) for lit in clause), default=0) > self.nb_variables:
+            self.nouvelle_variable()
+        litteraux = []
+        for lit in dict.fromkeys(clause):
+            if -lit in litteraux or self._valeur(lit) is True:
+                #Clause toujours vraie
+                return True
+            if self._valeur(lit) is None:
+                litteraux.append(lit)
+        if not litteraux:
+            self.incoherent = True
+            return False
+        if len(litteraux) == 1:
+            self._affecter(litteraux[0], None)
+            if self._propager() is not None:
+                self.incoherent = True
+                return False
+            return True
+        self._attacher(litteraux)
+        return True
+
+    #Propagation unitaire avec les deux littéraux surveillés. Renvoie la clause en conflit ou None.
+    def _propager(self):
+        while self.tete < len(self.trace):
+            faux = -self.trace[self.tete]
+            self.tete += 1
+            indice = self._indice(faux)
+            clauses = self.surveillees[indice]
+            gardees = []
+            for position, clause in enumerate(clauses):
+                #On range le littéral devenu faux en deuxième position
+                if clause[0] == faux:
+                    clause[0], clause[1] = clause[1], clause[0]
+                if self._valeur(clause[0]) is True:
+                    gardees.append(clause)
+                    continue
+                #On cherche un autre littéral non faux à surveiller
+                for k in range(2, len(clause)):
+                    if self._valeur(clause[k]) is not False:
+                        clause[1], clause[k] = clause[k], clause[1]
+                        self.surveillees[self._indice(clause[1])].append(clause)
+                        break
+                else:
+                    gardees.append(clause)
+                    if self._valeur(clause[0]) is False:
+                        #Conflit: toutes les autres clauses restent surveillées par ce littéral
+                        gardees.extend(clauses[position + 1:])
+                        self.surveillees[indice] = gardees
+                        return clause
+                    self._affecter(clause[0], clause)
+            self.surveillees[indice] = gardees
+        return None
+
+    #Analyse d'un conflit: on remonte les raisons jusqu'au premier point d'implication unique et on
+    #renvoie la clause apprise (son premier littéral devient vrai après le retour) et le niveau de retour
+    def _analyser(self, conflit):
+        niveau_courant = len(self.limites)
+        apprise = []
+        vues = set()
+        compteur = 0
+        clause = conflit
+        lit = None
+        position = len(self.trace) - 1
+        while True:
+            for autre in (clause if lit is None else clause[1:]):
+                variable = abs(autre)
+                if variable not in vues and self.niveaux[variable] > 0:
+                    vues.add(variable)
+                    self._augmenter(variable)
+                    if self.niveaux[variable] == niveau_courant:
+                        compteur += 1
+                    else:
+                        apprise.append(autre)
+            while abs(self.trace[position]) not in vues:
+                position -= 1
+            lit = self.trace[position]
+            position -= 1
+            compteur -= 1
+            if compteur == 0:
+                break
+            clause = self.raisons[abs(lit)]
+        apprise.insert(0, -lit)
+        if len(apprise) == 1:
+            return apprise, 0
+        #Le littéral du niveau le plus haut (après le premier) est surveillé en deuxième position
+        meilleur = max(range(1, len(apprise)), key=lambda k: self.niveaux[abs(apprise[k])])
+        apprise[1], apprise[meilleur] = apprise[meilleur], apprise[1]
+        return apprise, self.niveaux[abs(apprise[1])]
+
+    def _augmenter(self, variable):
+        self.activites[variable] += self.increment
+        if self.activites[variable] > 1e100:
+            self.activites = [activite * 1e-100 for activite in self.activites]
+            self.increment *= 1e-100
+            self.tas = [(-activite, v) for v, activite in enumerate(self.activites) if v and self.valeurs[v] is None]
+            heapq.heapify(self.tas)
+        heapq.heappush(self.tas, (-self.activites[variable], variable))
+
+    def _revenir(self, niveau):
+        if len(self.limites) <= niveau:
+            return
+        debut = self.limites[niveau]
+        for lit in self.trace[debut:]:
+            variable = abs(lit)
+            self.phases[variable] = lit > 0
+            self.valeurs[variable] = None
+            self.raisons[variable] = None
+            heapq.heappush(self.tas, (-self.activites[variable], variable))
+        del self.trace[debut:]
+        del self.limites[niveau:]
+        self.tete = len(self.trace)
+
+    def _choisir(self):
+        while self.tas:
+            _, variable = heapq.heappop(self.tas)
+            if self.valeurs[variable] is None:
+                return variable
+        return None
+
+    #Cherche un modèle. Renvoie True et remplit self.modele (valeur de chaque variable) si la formule
+    #est satisfiable, False sinon. Le budget éventuel (voir budget.py) est vérifié à chaque tour.
+    def resoudre(self, budget=None):
+        if self.incoherent:
+            return False
+        conflits, seuil = 0, 100
+        while True:
+            if budget is not None:
+                budget.verifier()
+            conflit = self._propager()
+            if conflit is not None:
+                if not self.limites:
+                    self.incoherent = True
+                    return False
+                apprise, niveau = self._analyser(conflit)
+                self._revenir(niveau)
+                if len(apprise) == 1:
+                    self._affecter(apprise[0], None)
+                else:
+                    self._attacher(apprise)
+                    self._affecter(apprise[0], apprise)
+                self.increment /= 0.95
+                conflits += 1
+                #Redémarrage: les clauses apprises sont gardées, seules les décisions sont oubliées
+                if conflits >= seuil:
+                    conflits, seuil = 0, int(seuil * 1.5)
+                    self._revenir(0)
+                continue
+            variable = self._choisir()
+            if variable is None:
+                self.modele = list(self.valeurs)
+                return True
+            self.limites.append(len(self.trace))
+            self._affecter(variable if self.phases[variable] else -variable, None)
+
+
+#Encodage CNF des étiquetages complets (ou stables) à partir des masques d'attaquants de chaque
+#argument: l'argument i a une variable IN (2i+1) et une variable OUT (2i+2), UNDEC si aucune des deux.
+# - un argument n'est pas à la fois IN et OUT
+# - IN si et seulement si tous ses attaquants sont OUT
+# - OUT si et seulement si l'un de ses attaquants est IN
+# - pour les extensions stables, chaque argument est IN ou OUT
+def encoder_etiquetages(masque_attaquants, stable):
+    clauses = []
+    for i, masque in enumerate(masque_attaquants):
+        arg_in, arg_out = 2 * i + 1, 2 * i + 2
+        attaquants = [j for j in range(masque.bit_length()) if masque >> j & 1]
+        clauses.append([-arg_in, -arg_out])
+        clauses.append([arg_in] + [-(2 * j + 2) for j in attaquants])
+        clauses.append([-arg_out] + [2 * j + 1 for j in attaquants])
+        for j in attaquants:
+            clauses.append([-arg_in, 2 * j + 2])
+            clauses.append([-(2 * j + 1), arg_out])
+        if stable:
+            clauses.append([arg_in, arg_out])
+    return clauses
+
+
+#Énumère les extensions sous forme de masques: après chaque modèle, une clause de blocage sur les
+#variables IN interdit de retrouver la même extension (l'ensemble IN détermine tout l'étiquetage)
+def enumerer_extensions(masque_attaquants, stable, budget=None):
+    solveur = SolveurCDCL()
+    for _ in range(2 * len(masque_attaquants)):
+        solveur.nouvelle_variable()
+    for clause in encoder_etiquetages(masque_attaquants, stable):
+        if not solveur.ajouter_clause(clause):
+            return
+    while solveur.resoudre(budget):
+        masque = 0
+        for i in range(len(masque_attaquants)):
+            if solveur.modele[2 * i + 1]:
+                masque |= 1 << i
+        yield masque
+        blocage = [-(2 * i + 1) if masque >> i & 1 else 2 * i + 1 for i in range(len(masque_attaquants))]
+        if not solveur.ajouter_clause(blocage):
+            return
@@ -0,0 +1,121 @@
+import argparse
+import asyncio
+import os
+import shlex
+import sys
+import threading
+from collections import OrderedDict
+
+from argumentation import Argumentation
+from budget import BudgetDepasse
+from project import MARQUEUR_INCOMPLET, creer_budget, creer_parser, repondre
+
+#Solveur en mode démon: le processus reste lancé, garde en mémoire les argumentations chargées et
+#leurs extensions déjà calculées, et répond aux mêmes requêtes que project.py.
+#Protocole: une requête par ligne, avec les mêmes options que project.py (par exemple
+#"-p DC-CO -f /chemin/af.apx -a A"), la réponse est la même sortie que project.py sur une ligne.
+#Un client peut envoyer plusieurs requêtes sur la même connexion.
+
+SOCKET_PAR_DEFAUT = os.path.join("/tmp", f"argumentation-{os.getuid()}.sock")
+
+
+class Serveur:
+    def __init__(self, max_argumentations=64):
+        if max_argumentations < 1:
+            raise ValueError("il faut garder au moins une argumentation en mémoire")
+        self.max_argumentations = max_argumentations
+        #Argumentations chargées, de la moins récemment utilisée à la plus récente. Les requêtes sont
+        #traitées sur plusieurs threads: le verrou protège les opérations sur le dictionnaire
+        self.argumentations = OrderedDict()
+        self.verrou = threading.Lock()
+        self.parser = creer_parser()
+
+    #Une argumentation est identifiée par son chemin, sa date de modification et sa taille:
+    #un fichier modifié est donc rechargé. Le chargement se fait hors du verrou; l'argumentation
+    #renvoyée est gardée dans une variable locale, un autre thread peut l'évincer entre temps.
+    def charger(self, chemin):
+        infos = os.stat(chemin)
+        cle = (os.path.abspath(chemin), infos.st_mtime_ns, infos.st_size)
+        with self.verrou:
+            chargee = self.argumentations.get(cle)
+            if chargee is not None:
+                self.argumentations.move_to_end(cle)
+                return chargee
+        chargee = (Argumentation.fichier_vers_arg(chemin), {})
+        with self.verrou:
+            #Un autre thread a pu charger le même fichier pendant ce temps: on garde le premier
+            chargee = self.argumentations.setdefault(cle, chargee)
+            self.argumentations.move_to_end(cle)
+            while len(self.argumentations) > self.max_argumentations:
+                self.argumentations.popitem(last=False)
+        return chargee
+
+    def traiter(self, ligne):
+        try:
+            requete = self.parser.parse_args(shlex.split(ligne))
+        except (SystemExit, ValueError):
+            return f"Requête invalide: {ligne}"
+        if not requete.p or not requete.f:
+            return "Les arguments -p et -f sont requis"
+        try:
+            af, memo = self.charger(requete.f)
+        except (OSError, ValueError) as erreur:
+            return f"Fichier illisible: {erreur}"
+        #Le budget (--timeout, --max-memory) porte sur la requête seule; la réponse partielle est
+        #suivie du marqueur sur la même ligne
+        try:
+            return repondre(af, requete.p, requete.a, requete.engine, requete.jobs, memo, limite=requete.limit,
+                            budget=creer_budget(requete))
+        except BudgetDepasse as depassement:
+            return " ".join(filter(None, (depassement.sortie, MARQUEUR_INCOMPLET)))
+        except Exception as erreur:
+            #Toute autre erreur (moteur indisponible...) devient une réponse, la connexion reste ouverte
+            return f"Erreur: {erreur}"
+
+    async def client(self, lecteur, ecrivain):
+        boucle = asyncio.get_running_loop()
+        try:
+            while True:
+                ligne = await lecteur.readline()
+                if not ligne:
+                    break
+                ligne = ligne.decode().strip()
+                if not ligne:
+                    continue
+                #Le calcul se fait hors de la boucle pour que les autres clients restent servis
+                reponse = await boucle.run_in_executor(None, self.traiter, ligne)
+                ecrivain.write(reponse.encode() + b"\n")
+                await ecrivain.drain()
+        finally:
+            ecrivain.close()
+
+    async def servir(self, chemin=None, hote=None, port=None):
+        if port is not None:
+            serveur = await asyncio.start_server(self.client, hote or "127.0.0.1", port)
+        else:
+            if os.path.exists(chemin):
+                os.unlink(chemin)
+            serveur = await asyncio.start_unix_server(self.client, chemin)
+        async with serveur:
+            await serveur.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Argumentation Solveur (démon)")
+    parser.add_argument("--socket", default=SOCKET_PAR_DEFAUT)
+    parser.add_argument("--host", default=None)
+    parser.add_argument("--port", type=int, default=None)
+    parser.add_argument("--max-frameworks", type=int, default=64)
+    args = parser.parse_args(argv)
+    if args.max_frameworks < 1:
+        parser.error("--max-frameworks doit valoir au moins 1")
+    adresse = f"{args.host or '127.0.0.1'}:{args.port}" if args.port is not None else args.socket
+    print(f"Serveur en écoute sur {adresse}", file=sys.stderr)
+    try:
+        asyncio.run(Serveur(args.max_frameworks).servir(args.socket, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
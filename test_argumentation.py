@@ -0,0 +1,217 @@
+import random
+from concurrent.futures import ThreadPoolExecutor
+from itertools import combinations, product
+
+from argumentation import Argumentation
+from caracteristique import FonctionCaracteristique
+from compacte import ArgumentationCompacte
+from masques import bits, masque_de
+from serveur import Serveur
+
+#Tests des classes de la bibliothèque, sans passer par la ligne de commande (voir test_runner.py pour
+#les requêtes de project.py). Ils se lancent avec pytest ou directement: python3 test_argumentation.py
+
+#Des argumentations avec cycles, auto attaques et arguments isolés
+ARGUMENTATIONS = [
+    ({"a", "b", "c", "d", "e"}, {("a", "b"), ("b", "c"), ("c", "d"), ("d", "c")}),
+    ({"a", "b", "c", "d", "e"}, {("a", "b"), ("b", "c"), ("c", "d"), ("d", "e"), ("e", "a")}),
+    ({"a", "b", "c", "d"}, {("a", "a"), ("a", "b"), ("b", "c"), ("c", "b"), ("c", "d")}),
+    ({"a", "b", "c"}, set()),
+]
+
+
+def sous_ensembles(arguments):
+    for r in range(len(arguments) + 1):
+        yield from (set(combinaison) for combinaison in combinations(sorted(arguments), r))
+
+
+#Définitions directes, calculées sur les paires d'attaques
+def defendus(arguments, attaque, sousens):
+    attaques = {cible for attaquant, cible in attaque if attaquant in sousens}
+    return {arg for arg in arguments
+            if all(attaquant in attaques for attaquant, cible in attaque if cible == arg)}
+
+
+def sans_conflit(attaque, sousens):
+    return not any(attaquant in sousens and cible in sousens for attaquant, cible in attaque)
+
+
+def verifier_caracteristique(af, caracteristique, sousens):
+    arguments, attaque = af.arguments, af.attaque
+    assert af._vers_ensemble(caracteristique.masque) == sousens
+    assert af._vers_ensemble(caracteristique.defendus()) == defendus(arguments, attaque, sousens)
+    assert caracteristique.sans_conflit() == sans_conflit(attaque, sousens)
+    admissible = sans_conflit(attaque, sousens) and sousens <= defendus(arguments, attaque, sousens)
+    assert caracteristique.admissible() == admissible
+    assert caracteristique.complete() == (admissible and sousens == defendus(arguments, attaque, sousens))
+    attaques = {cible for attaquant, cible in attaque if attaquant in sousens}
+    assert caracteristique.stable() == (sans_conflit(attaque, sousens) and sousens | attaques == arguments)
+
+
+def test_masques():
+    assert masque_de([]) == 0
+    assert masque_de([0, 3, 9]) == 0b1000001001
+    assert list(bits(0b1000001001)) == [0, 3, 9]
+    assert list(bits(masque_de(range(70)))) == list(range(70))
+
+
+#F(S) construite d'un coup pour chaque sous ensemble
+def test_caracteristique_depart():
+    for arguments, attaque in ARGUMENTATIONS:
+        af = Argumentation(arguments, attaque)
+        for sousens in sous_ensembles(arguments):
+            caracteristique = FonctionCaracteristique(af.masque_attaquants, af.masque_cibles,
+                                                      af._vers_masque(sousens))
+            verifier_caracteristique(af, caracteristique, sousens)
+
+
+#F(S) tenue à jour par ajouter et retirer, dans l'ordre du code de Gray puis en vidant S
+def test_caracteristique_ajouter_retirer():
+    for arguments, attaque in ARGUMENTATIONS:
+        af = Argumentation(arguments, attaque)
+        caracteristique = FonctionCaracteristique(af.masque_attaquants, af.masque_cibles)
+        verifier_caracteristique(af, caracteristique, set())
+        for k in range(1, 1 << len(arguments)):
+            i = (k & -k).bit_length() - 1
+            if caracteristique.dans[i]:
+                caracteristique.retirer(i)
+            else:
+                caracteristique.ajouter(i)
+            verifier_caracteristique(af, caracteristique, af._vers_ensemble(caracteristique.masque))
+        for i in list(bits(caracteristique.masque)):
+            caracteristique.retirer(i)
+            verifier_caracteristique(af, caracteristique, af._vers_ensemble(caracteristique.masque))
+
+
+#Ce que doit donner une argumentation: ses index et ses extensions pour chaque sémantique
+def resume(af):
+    extensions = {semantique: {frozenset(extension) for extension in af.iter_extensions(semantique)}
+                  for semantique in ("CO", "ST")}
+    extensions["PR"] = {frozenset(extension) for extension in af.extensions_preferred()}
+    extensions["GR"] = frozenset(af.extension_grounded())
+    return (af.arguments, af.attaque, dict(af.attackers_of), dict(af.targets_of), extensions,
+            {arg: (af.credulous(arg, "PR"), af.skeptical(arg, "CO")) for arg in sorted(af.arguments)})
+
+
+#Une modification tirée au hasard: le nom de la méthode et ses arguments
+def modification_au_hasard(alea, af):
+    noms = ["a", "b", "c", "d", "e", "f", "g"]
+    modification = alea.randrange(4)
+    if modification == 0:
+        return "add_argument", (alea.choice(noms),)
+    if modification == 1 and af.arguments:
+        return "remove_argument", (alea.choice(sorted(af.arguments)),)
+    if modification == 2:
+        #L'attaque peut mentionner un argument non déclaré, qui ne compte qu'une fois ajouté
+        return "add_attack", (alea.choice(noms), alea.choice(sorted(af.arguments) or noms))
+    if af.attaque:
+        return "remove_attack", alea.choice(sorted(af.attaque))
+    return "add_argument", (alea.choice(noms),)
+
+
+#Après chaque modification, l'argumentation modifiée doit donner la même chose qu'une argumentation
+#construite directement avec ses arguments et ses attaques
+def test_modifications():
+    alea = random.Random(0)
+    for (arguments, attaque), numeros in product(ARGUMENTATIONS, (False, True)):
+        copie_arguments, copie_attaque = set(arguments), set(attaque)
+        if numeros:
+            #Les index d'une argumentation construite par depuis_numeros ne sont faits qu'au premier accès
+            etiquettes = sorted(arguments)
+            af = Argumentation.depuis_numeros(etiquettes, [etiquettes.index(i) for i, _ in attaque],
+                                              [etiquettes.index(j) for _, j in attaque])
+        else:
+            af = Argumentation(arguments, attaque)
+        for _ in range(60):
+            nom, parametres = modification_au_hasard(alea, af)
+            getattr(af, nom)(*parametres)
+            neuve = Argumentation(af.arguments, af.attaque)
+            assert resume(af) == resume(neuve)
+        #Les ensembles reçus par le constructeur ne sont pas modifiés
+        assert (arguments, attaque) == (copie_arguments, copie_attaque)
+
+
+#Les vérifications de ArgumentationCompacte, faites sur le CSR, et ses recherches doivent donner les
+#mêmes résultats que Argumentation, y compris après les mêmes modifications
+def test_compacte():
+    alea = random.Random(1)
+    for arguments, attaque in ARGUMENTATIONS:
+        af, compacte = Argumentation(arguments, attaque), ArgumentationCompacte(arguments, attaque)
+        for _ in range(40):
+            assert resume(compacte) == resume(af)
+            for sousens in sous_ensembles(af.arguments | {"z"}):
+                for verification in ("est_sans_conflit", "est_admissible", "est_complete", "est_stable"):
+                    assert getattr(compacte, verification)(sousens) == getattr(af, verification)(sousens)
+                for arg in af.arguments | {"z"}:
+                    assert compacte.defends(arg, sousens) == af.defends(arg, sousens)
+            nom, parametres = modification_au_hasard(alea, af)
+            getattr(af, nom)(*parametres)
+            getattr(compacte, nom)(*parametres)
+
+
+#Choix documenté dans argumentation.py: un attaquant non déclaré ne compte pour aucune sémantique
+#(la version d'origine donnait [['b']] en CO ici: a ne pouvait pas être défendu contre z)
+def test_attaquant_non_declare():
+    for classe in (Argumentation, ArgumentationCompacte):
+        af = classe({"a", "b"}, {("z", "a")})
+        for semantique in ("CO", "ST"):
+            assert list(af.iter_extensions(semantique)) == [{"a", "b"}]
+        assert af.defends("a", set()) and af.est_complete({"a", "b"})
+
+
+#Une attaque vers ou depuis un argument non déclaré ne compte qu'une fois l'argument ajouté
+def test_compacte_argument_non_declare():
+    for classe in (Argumentation, ArgumentationCompacte):
+        af = classe({"x"}, set())
+        af.add_attack("y", "x")
+        assert af.arguments == {"x"} and af.attaque == {("y", "x")}
+        assert list(af.iter_extensions("CO")) == [{"x"}]
+        af.add_argument("y")
+        assert list(af.iter_extensions("CO")) == [{"y"}]
+
+
+def test_compacte_fichier():
+    for chemin in ("test_af1.apx", "test_af3.apx", "test_af1.tgf", "test_af1.afb", "test_af_commentaires.apx"):
+        af, compacte = Argumentation.fichier_vers_arg(chemin), ArgumentationCompacte.fichier_vers_arg(chemin)
+        assert resume(compacte) == resume(af)
+
+
+def test_compacte_sizeof():
+    vide = ArgumentationCompacte(set(), set()).sizeof()
+    rapport = ArgumentationCompacte.fichier_vers_arg("test_af3.apx").sizeof()
+    assert set(rapport) == {"objet", "etiquettes", "debuts", "attaquants", "hors", "total"}
+    assert rapport["total"] == sum(taille for nom, taille in rapport.items() if nom != "total")
+    #4 octets par attaque et par argument dans les array("i")
+    af = Argumentation.fichier_vers_arg("test_af3.apx")
+    assert rapport["attaquants"] - vide["attaquants"] >= 4 * len(af.attaque)
+    assert rapport["debuts"] - vide["debuts"] >= 4 * len(af.arguments)
+
+#Le démon garde au plus max_argumentations argumentations; les requêtes arrivent sur plusieurs threads
+#et chacune reçoit sa réponse même quand une autre évince l'argumentation qu'elle vient de charger
+def test_serveur_eviction():
+    try:
+        Serveur(0)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Serveur(0) doit être refusé")
+    requetes = {
+        "-p SE-CO -f test_af1.apx": "[[], ['A', 'D'], ['B', 'D']]",
+        "-p CE-ST -f test_af4.apx": "5",
+        "-p DC-CO -f test_af3.apx -a A": "YES",
+        "-p SE-CO -f test_af1.tgf": "[[], ['A', 'D'], ['B', 'D']]",
+    }
+    serveur = Serveur(1)
+    with ThreadPoolExecutor(8) as executeur:
+        lignes = list(requetes) * 25
+        for ligne, reponse in zip(lignes, executeur.map(serveur.traiter, lignes)):
+            assert reponse == requetes[ligne], (ligne, reponse)
+    assert len(serveur.argumentations) == 1
+    assert serveur.traiter('-p SE-CO -f "test_af1.apx').startswith("Requête invalide")
+
+
+if __name__ == "__main__":
+    for nom, test in list(globals().items()):
+        if nom.startswith("test_") and callable(test):
+            test()
+            print(f"✔ {nom}")
@@ -1,4 +1,12 @@
-import subprocess
+import importlib.util
+import io
+import os
+import shlex
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stderr, redirect_stdout
+
+import project
 
 
 # Liste des tests pour le fichier af3.apx
@@ -29,45 +37,45 @@ tests = [
     # Skeptically accepted arguments
     {
         "command": "python3 project.py -p DS-ST -f test_af1.apx -a A",
-        "expected_output": "Skeptically accepted arguments:\nD"
+        "expected_output": "NO"
     },
     {
         "command": "python3 project.py -p DS-ST -f test_af1.apx -a B",
-        "expected_output": "Skeptically accepted arguments:\nD"
+        "expected_output": "NO"
     },
     {
         "command": "python3 project.py -p DS-ST -f test_af1.apx -a C",
-        "expected_output": "Skeptically accepted arguments:\nD"
+        "expected_output": "NO"
     },
     {
         "command": "python3 project.py -p DS-ST -f test_af1.apx -a D",
-        "expected_output": "Skeptically accepted arguments:\nD"
+        "expected_output": "YES"
     },
     {
         "command": "python3 project.py -p DS-ST -f test_af1.apx -a E",
-        "expected_output": "Skeptically accepted arguments:\nD"
+        "expected_output": "NO"
     },
 
     # Credulously accepted arguments
     {
         "command": "python3 project.py -p DC-ST -f test_af1.apx -a A",
-        "expected_output": "Credulously accepted arguments:\nA, B, D"
+        "expected_output": "YES"
     },
     {
         "command": "python3 project.py -p DC-ST -f test_af1.apx -a B",
-        "expected_output": "Credulously accepted arguments:\nA, B, D"
+        "expected_output": "YES"
     },
     {
         "command": "python3 project.py -p DC-ST -f test_af1.apx -a C",
-        "expected_output": "Credulously accepted arguments:\nA, B, D"
+        "expected_output": "NO"
     },
     {
         "command": "python3 project.py -p DC-ST -f test_af1.apx -a D",
-        "expected_output": "Credulously accepted arguments:\nA, B, D"
+        "expected_output": "YES"
     },
     {
         "command": "python3 project.py -p DC-ST -f test_af1.apx -a E",
-        "expected_output": "Credulously accepted arguments:\nA, B, D"
+        "expected_output": "NO"
     },
 
     # Complete extensions
@@ -95,45 +103,45 @@ tests = [
     # Skeptically accepted arguments for complete extensions
     {
         "command": "python3 project.py -p DS-CO -f test_af1.apx -a A",
-        "expected_output": "Skeptically accepted arguments:\nNone of them"
+        "expected_output": "NO"
     },
     {
         "command": "python3 project.py -p DS-CO -f test_af1.apx -a B",
-        "expected_output": "Skeptically accepted arguments:\nNone of them"
+        "expected_output": "NO"
     },
     {
         "command": "python3 project.py -p DS-CO -f test_af1.apx -a C",
-        "expected_output": "Skeptically accepted arguments:\nNone of them"
+        "expected_output": "NO"
     },
     {
         "command": "python3 project.py -p DS-CO -f test_af1.apx -a D",
-        "expected_output": "Skeptically accepted arguments:\nNone of them"
+        "expected_output": "NO"
     },
     {
         "command": "python3 project.py -p DS-CO -f test_af1.apx -a E",
-        "expected_output": "Skeptically accepted arguments:\nNone of them"
+        "expected_output": "NO"
     },
 
     # Credulously accepted arguments for complete extensions
     {
         "command": "python3 project.py -p DC-CO -f test_af1.apx -a A",
-        "expected_output": "Credulously accepted arguments:\nA, B, D"
+        "expected_output": "YES"
     },
     {
         "command": "python3 project.py -p DC-CO -f test_af1.apx -a B",
-        "expected_output": "Credulously accepted arguments:\nA, B, D"
+        "expected_output": "YES"
     },
     {
         "command": "python3 project.py -p DC-CO -f test_af1.apx -a C",
-        "expected_output": "Credulously accepted arguments:\nA, B, D"
+        "expected_output": "NO"
     },
     {
         "command": "python3 project.py -p DC-CO -f test_af1.apx -a D",
-        "expected_output": "Credulously accepted arguments:\nA, B, D"
+        "expected_output": "YES"
     },
     {
         "command": "python3 project.py -p DC-CO -f test_af1.apx -a E",
-        "expected_output": "Credulously accepted arguments:\nA, B, D"
+        "expected_output": "NO"
     },
     
     # Complete extensions
@@ -149,70 +157,70 @@ tests = [
     # Credulously accepted arguments for complete extensions
     {
         "command": "python3 project.py -p DC-CO -f test_af2.apx -a A",
-        "expected_output": "Credulously accepted arguments:\nA"
+        "expected_output": "YES"
     },
     {
         "command": "python3 project.py -p DC-CO -f test_af2.apx -a B",
-        "expected_output": "Credulously accepted arguments:\nB"
+        "expected_output": "YES"
     },
     {
         "command": "python3 project.py -p DC-CO -f test_af2.apx -a D",
-        "expected_output": "Credulously accepted arguments:\nD"
+        "expected_output": "YES"
     },
     {
         "command": "python3 project.py -p DC-CO -f test_af2.apx -a E",
-        "expected_output": "Credulously accepted arguments:\nE"
+        "expected_output": "YES"
     },
     # Skeptically accepted arguments for complete extensions
     {
         "command": "python3 project.py -p DS-CO -f test_af2.apx -a A",
-        "expected_output": "Skeptically accepted arguments:\nNone of them"
+        "expected_output": "NO"
     },
     {
         "command": "python3 project.py -p DS-CO -f test_af2.apx -a B",
-        "expected_output": "Skeptically accepted arguments:\nNone of them"
+        "expected_output": "NO"
     },
     {
         "command": "python3 project.py -p DS-CO -f test_af2.apx -a D",
-        "expected_output": "Skeptically accepted arguments:\nNone of them"
+        "expected_output": "NO"
     },
     {
         "command": "python3 project.py -p DS-CO -f test_af2.apx -a E",
-        "expected_output": "Skeptically accepted arguments:\nNone of them"
+        "expected_output": "NO"
     },
     # Credulously accepted arguments for stable extensions
     {
         "command": "python3 project.py -p DC-ST -f test_af2.apx -a A",
-        "expected_output": "Credulously accepted arguments:\nA"
+        "expected_output": "YES"
     },
     {
         "command": "python3 project.py -p DC-ST -f test_af2.apx -a B",
-        "expected_output": "Credulously accepted arguments:\nB"
+        "expected_output": "YES"
     },
     {
         "command": "python3 project.py -p DC-ST -f test_af2.apx -a D",
-        "expected_output": "Credulously accepted arguments:\nD"
+        "expected_output": "YES"
     },
     {
         "command": "python3 project.py -p DC-ST -f test_af2.apx -a E",
-        "expected_output": "Credulously accepted arguments:\nE"
+        "expected_output": "YES"
     },
     # Skeptically accepted arguments for stable extensions
     {
         "command": "python3 project.py -p DS-ST -f test_af2.apx -a A",
-        "expected_output": "Skeptically accepted arguments:\nNone of them"
+        "expected_output": "NO"
     },
     {
         "command": "python3 project.py -p DS-ST -f test_af2.apx -a B",
-        "expected_output": "Skeptically accepted arguments:\nNone of them"
+        "expected_output": "NO"
     },
     {
         "command": "python3 project.py -p DS-ST -f test_af2.apx -a D",
-        "expected_output": "Skeptically accepted arguments:\nNone of them"
+        "expected_output": "NO"
     },
     {
         "command": "python3 project.py -p DS-ST -f test_af2.apx -a E",
-        "expected_output": "Skeptically accepted arguments:\nNone of them"
+        "expected_output": "NO"
     },
     
     # Complete extensions
@@ -228,54 +236,54 @@ tests = [
     # Credulously accepted arguments for complete extensions
     {
         "command": "python3 project.py -p DC-CO -f test_af3.apx -a A",
-        "expected_output": "Credulously accepted arguments:\nA"
+        "expected_output": "YES"
     },
     {
         "command": "python3 project.py -p DC-CO -f test_af3.apx -a D",
-        "expected_output": "Credulously accepted arguments:\nD"
+        "expected_output": "YES"
     },
     {
         "command": "python3 project.py -p DC-CO -f test_af3.apx -a E",
-        "expected_output": "Credulously accepted arguments:\nE"
+        "expected_output": "YES"
     },
     # Skeptically accepted arguments for complete extensions
     {
         "command": "python3 project.py -p DS-CO -f test_af3.apx -a A",
-        "expected_output": "Skeptically accepted arguments:\nNone of them"
+        "expected_output": "NO"
     },
     {
         "command": "python3 project.py -p DS-CO -f test_af3.apx -a D",
-        "expected_output": "Skeptically accepted arguments:\nNone of them"
+        "expected_output": "NO"
     },
     {
         "command": "python3 project.py -p DS-CO -f test_af3.apx -a E",
-        "expected_output": "Skeptically accepted arguments:\nNone of them"
+        "expected_output": "NO"
     },
     # Credulously accepted arguments for stable extensions
     {
         "command": "python3 project.py -p DC-ST -f test_af3.apx -a A",
-        "expected_output": "Credulously accepted arguments:\nA"
+        "expected_output": "YES"
     },
     {
         "command": "python3 project.py -p DC-ST -f test_af3.apx -a D",
-        "expected_output": "Credulously accepted arguments:\nD"
+        "expected_output": "YES"
     },
     {
         "command": "python3 project.py -p DC-ST -f test_af3.apx -a E",
-        "expected_output": "Credulously accepted arguments:\nE"
+        "expected_output": "YES"
     },
     # Skeptically accepted arguments for stable extensions
     {
         "command": "python3 project.py -p DS-ST -f test_af3.apx -a A",
-        "expected_output": "Skeptically accepted arguments:\nA"
+        "expected_output": "YES"
     },
     {
         "command": "python3 project.py -p DS-ST -f test_af3.apx -a D",
-        "expected_output": "Skeptically accepted arguments:\nNone of them"
+        "expected_output": "NO"
     },
     {
         "command": "python3 project.py -p DS-ST -f test_af3.apx -a E",
-        "expected_output": "Skeptically accepted arguments:\nNone of them"
+        "expected_output": "NO"
     },
     
     
@@ -292,303 +300,1051 @@ tests = [
     # Credulously accepted arguments for complete extensions
     {
         "command": "python3 project.py -p DC-CO -f test_af4.apx -a A",
-        "expected_output": "Credulously accepted arguments:\nA"
+        "expected_output": "YES"
     },
     {
         "command": "python3 project.py -p DC-CO -f test_af4.apx -a B",
-        "expected_output": "Credulously accepted arguments:\nB"
+        "expected_output": "YES"
     },
     {
         "command": "python3 project.py -p DC-CO -f test_af4.apx -a C",
-        "expected_output": "Credulously accepted arguments:\nC"
+        "expected_output": "YES"
     },
     {
         "command": "python3 project.py -p DC-CO -f test_af4.apx -a D",
-        "expected_output": "Credulously accepted arguments:\nD"
+        "expected_output": "YES"
     },
     {
         "command": "python3 project.py -p DC-CO -f test_af4.apx -a E",
-        "expected_output": "Credulously accepted arguments:\nE"
+        "expected_output": "YES"
     },
     # Skeptically accepted arguments for complete extensions
     {
         "command": "python3 project.py -p DS-CO -f test_af4.apx -a A",
-        "expected_output": "Skeptically accepted arguments:\nNone of them"
+        "expected_output": "NO"
     },
     {
         "command": "python3 project.py -p DS-CO -f test_af4.apx -a B",
-        "expected_output": "Skeptically accepted arguments:\nNone of them"
+        "expected_output": "NO"
     },
     {
         "command": "python3 project.py -p DS-CO -f test_af4.apx -a C",
-        "expected_output": "Skeptically accepted arguments:\nNone of them"
+        "expected_output": "NO"
     },
     {
         "command": "python3 project.py -p DS-CO -f test_af4.apx -a D",
-        "expected_output": "Skeptically accepted arguments:\nNone of them"
+        "expected_output": "NO"
     },
     {
         "command": "python3 project.py -p DS-CO -f test_af4.apx -a E",
-        "expected_output": "Skeptically accepted arguments:\nNone of them"
+        "expected_output": "NO"
     },
     # Credulously accepted arguments for stable extensions
     {
         "command": "python3 project.py -p DC-ST -f test_af4.apx -a A",
-        "expected_output": "Credulously accepted arguments:\nA"
+        "expected_output": "YES"
     },
     {
         "command": "python3 project.py -p DC-ST -f test_af4.apx -a B",
-        "expected_output": "Credulously accepted arguments:\nB"
+        "expected_output": "YES"
     },
     {
         "command": "python3 project.py -p DC-ST -f test_af4.apx -a C",
-        "expected_output": "Credulously accepted arguments:\nC"
+        "expected_output": "YES"
     },
     {
         "command": "python3 project.py -p DC-ST -f test_af4.apx -a D",
-        "expected_output": "Credulously accepted arguments:\nD"
+        "expected_output": "YES"
     },
     {
         "command": "python3 project.py -p DC-ST -f test_af4.apx -a E",
-        "expected_output": "Credulously accepted arguments:\nE"
+        "expected_output": "YES"
     },
     # Skeptically accepted arguments for stable extensions
     {
         "command": "python3 project.py -p DS-ST -f test_af4.apx -a A",
-        "expected_output": "Skeptically accepted arguments:\nNone of them"
+        "expected_output": "NO"
     },
     {
         "command": "python3 project.py -p DS-ST -f test_af4.apx -a B",
-        "expected_output": "Skeptically accepted arguments:\nNone of them"
+        "expected_output": "NO"
     },
     {
         "command": "python3 project.py -p DS-ST -f test_af4.apx -a C",
-        "expected_output": "Skeptically accepted arguments:\nNone of them"
+        "expected_output": "NO"
     },
     {
         "command": "python3 project.py -p DS-ST -f test_af4.apx -a D",
-        "expected_output": "Skeptically accepted arguments:\nNone of them"
+        "expected_output": "NO"
     },
     {
         "command": "python3 project.py -p DS-ST -f test_af4.apx -a E",
-        "expected_output": "Skeptically accepted arguments:\nNone of them"
+        "expected_output": "NO"
     },
     
     # Stable extensions
     # Stable extensions
     {
         "command": "python3 project.py -p SE-ST -f test_af5.apx",
-        "expected_output": "Stable extensions:\n[['A', 'C', 'F']]"
+        "expected_output": "[['A', 'C', 'F']]"
     },
     {
         "command": "python3 project.py -p SE-ST -f test_af5.apx",
-        "expected_output": "Stable extensions:\n[['A', 'C', 'F']]"
+        "expected_output": "[['A', 'C', 'F']]"
     },
     {
         "command": "python3 project.py -p SE-ST -f test_af5.apx",
-        "expected_output": "Stable extensions:\n[['A', 'C', 'F']]"
+        "expected_output": "[['A', 'C', 'F']]"
     },
     {
         "command": "python3 project.py -p SE-ST -f test_af5.apx",
-        "expected_output": "Stable extensions:\n[['A', 'C', 'F']]"
+        "expected_output": "[['A', 'C', 'F']]"
     },
     {
         "command": "python3 project.py -p SE-ST -f test_af5.apx",
-        "expected_output": "Stable extensions:\n[['A', 'C', 'F']]"
+        "expected_output": "[['A', 'C', 'F']]"
     },
 
     # Skeptically accepted arguments
     {
         "command": "python3 project.py -p DS-ST -f test_af5.apx -a A",
-        "expected_output": "Skeptically accepted arguments:\nA, C, F"
+        "expected_output": "YES"
     },
     {
         "command": "python3 project.py -p DS-ST -f test_af5.apx -a B",
-        "expected_output": "Skeptically accepted arguments:\nNone of them"
+        "expected_output": "NO"
     },
     {
         "command": "python3 project.py -p DS-ST -f test_af5.apx -a C",
-        "expected_output": "Skeptically accepted arguments:\nA, C, F"
+        "expected_output": "YES"
     },
     {
         "command": "python3 project.py -p DS-ST -f test_af5.apx -a D",
-        "expected_output": "Skeptically accepted arguments:\nNone of them"
+        "expected_output": "NO"
     },
     {
         "command": "python3 project.py -p DS-ST -f test_af5.apx -a E",
-        "expected_output": "Skeptically accepted arguments:\nNone of them"
+        "expected_output": "NO"
     },
 
     # Credulously accepted arguments
     {
         "command": "python3 project.py -p DC-ST -f test_af5.apx -a A",
-        "expected_output": "Credulously accepted arguments:\nA, C, F"
+        "expected_output": "YES"
     },
     {
         "command": "python3 project.py -p DC-ST -f test_af5.apx -a B",
-        "expected_output": "Credulously accepted arguments:\nNone of them"
+        "expected_output": "NO"
     },
     {
         "command": "python3 project.py -p DC-ST -f test_af5.apx -a C",
-        "expected_output": "Credulously accepted arguments:\nA, C, F"
+        "expected_output": "YES"
     },
     {
         "command": "python3 project.py -p DC-ST -f test_af5.apx -a D",
-        "expected_output": "Credulously accepted arguments:\nNone of them"
+        "expected_output": "NO"
     },
     {
         "command": "python3 project.py -p DC-ST -f test_af5.apx -a E",
-        "expected_output": "Credulously accepted arguments:\nNone of them"
+        "expected_output": "NO"
     },
 
     # Complete extensions
     {
         "command": "python3 project.py -p SE-CO -f test_af5.apx",
-        "expected_output": "Complete extensions:\n[[], ['A', 'C', 'F']]"
+        "expected_output": "[[], ['A', 'C', 'F']]"
     },
     {
         "command": "python3 project.py -p SE-CO -f test_af5.apx",
-        "expected_output": "Complete extensions:\n[[], ['A', 'C', 'F']]"
+        "expected_output": "[[], ['A', 'C', 'F']]"
     },
     {
         "command": "python3 project.py -p SE-CO -f test_af5.apx",
-        "expected_output": "Complete extensions:\n[[], ['A', 'C', 'F']]"
+        "expected_output": "[[], ['A', 'C', 'F']]"
     },
     {
         "command": "python3 project.py -p SE-CO -f test_af5.apx",
-        "expected_output": "Complete extensions:\n[[], ['A', 'C', 'F']]"
+        "expected_output": "[[], ['A', 'C', 'F']]"
     },
     {
         "command": "python3 project.py -p SE-CO -f test_af5.apx",
-        "expected_output": "Complete extensions:\n[[], ['A', 'C', 'F']]"
+        "expected_output": "[[], ['A', 'C', 'F']]"
     },
 
     # Skeptically accepted arguments for complete extensions
     {
         "command": "python3 project.py -p DS-CO -f test_af5.apx -a A",
-        "expected_output": "Skeptically accepted arguments:\nNone of them"
+        "expected_output": "NO"
     },
     {
         "command": "python3 project.py -p DS-CO -f test_af5.apx -a B",
-        "expected_output": "Skeptically accepted arguments:\nNone of them"
+        "expected_output": "NO"
     },
     {
         "command": "python3 project.py -p DS-CO -f test_af5.apx -a C",
-        "expected_output": "Skeptically accepted arguments:\nNone of them"
+        "expected_output": "NO"
     },
     {
         "command": "python3 project.py -p DS-CO -f test_af5.apx -a D",
-        "expected_output": "Skeptically accepted arguments:\nNone of them"
+        "expected_output": "NO"
     },
     {
         "command": "python3 project.py -p DS-CO -f test_af5.apx -a E",
-        "expected_output": "Skeptically accepted arguments:\nNone of them"
+        "expected_output": "NO"
     },
 
     # Credulously accepted arguments for complete extensions
     {
         "command": "python3 project.py -p DC-CO -f test_af5.apx -a A",
-        "expected_output": "Credulously accepted arguments:\nA, C, F"
+        "expected_output": "YES"
     },
     {
         "command": "python3 project.py -p DC-CO -f test_af5.apx -a B",
-        "expected_output": "Credulously accepted arguments:\nNone of them"
+        "expected_output": "NO"
     },
     {
         "command": "python3 project.py -p DC-CO -f test_af5.apx -a C",
-        "expected_output": "Credulously accepted arguments:\nA, C, F"
+        "expected_output": "YES"
     },
     {
         "command": "python3 project.py -p DC-CO -f test_af5.apx -a D",
-        "expected_output": "Credulously accepted arguments:\nNone of them"
+        "expected_output": "NO"
     },
     {
         "command": "python3 project.py -p DC-CO -f test_af5.apx -a E",
-        "expected_output": "Credulously accepted arguments:\nNone of them"
+        "expected_output": "NO"
     },
     {
         "command": "python3 project.py -p DC-CO -f test_af5.apx -a F",
-        "expected_output": "Credulously accepted arguments:\nNone of them"
+        "expected_output": "YES"
+    },
+
+    # Grounded extension
+    {
+        "command": "python3 project.py -p SE-GR -f test_af1.apx",
+        "expected_output": "[]"
+    },
+    {
+        "command": "python3 project.py -p SE-GR -f test_af2.apx",
+        "expected_output": "[]"
+    },
+    {
+        "command": "python3 project.py -p SE-GR -f test_af3.apx",
+        "expected_output": "[]"
+    },
+    {
+        "command": "python3 project.py -p SE-GR -f test_af4.apx",
+        "expected_output": "[]"
+    },
+    {
+        "command": "python3 project.py -p SE-GR -f test_af5.apx",
+        "expected_output": "[]"
+    },
+    {
+        "command": "python3 project.py -p SE-GR -f test_af6.apx",
+        "expected_output": "['A', 'C']"
+    },
+    {
+        "command": "python3 project.py -p SE-CO -f test_af6.apx",
+        "expected_output": "[['A', 'C'], ['A', 'C', 'E'], ['A', 'C', 'F']]"
+    },
+    {
+        "command": "python3 project.py -p SE-ST -f test_af6.apx",
+        "expected_output": "[['A', 'C', 'E'], ['A', 'C', 'F']]"
+    },
+
+    # Credulously accepted arguments for the grounded extension
+    {
+        "command": "python3 project.py -p DC-GR -f test_af6.apx -a A",
+        "expected_output": "YES"
+    },
+    {
+        "command": "python3 project.py -p DC-GR -f test_af6.apx -a B",
+        "expected_output": "NO"
+    },
+    {
+        "command": "python3 project.py -p DC-GR -f test_af6.apx -a C",
+        "expected_output": "YES"
+    },
+    {
+        "command": "python3 project.py -p DC-GR -f test_af6.apx -a D",
+        "expected_output": "NO"
+    },
+    {
+        "command": "python3 project.py -p DC-GR -f test_af6.apx -a E",
+        "expected_output": "NO"
+    },
+    {
+        "command": "python3 project.py -p DC-GR -f test_af6.apx -a F",
+        "expected_output": "NO"
+    },
+
+    # Skeptically accepted arguments for the grounded extension
+    {
+        "command": "python3 project.py -p DS-GR -f test_af6.apx -a A",
+        "expected_output": "YES"
+    },
+    {
+        "command": "python3 project.py -p DS-GR -f test_af6.apx -a B",
+        "expected_output": "NO"
+    },
+    {
+        "command": "python3 project.py -p DS-GR -f test_af6.apx -a C",
+        "expected_output": "YES"
+    },
+    {
+        "command": "python3 project.py -p DS-GR -f test_af6.apx -a D",
+        "expected_output": "NO"
+    },
+    {
+        "command": "python3 project.py -p DS-GR -f test_af6.apx -a E",
+        "expected_output": "NO"
+    },
+    {
+        "command": "python3 project.py -p DS-GR -f test_af6.apx -a F",
+        "expected_output": "NO"
+    },
+
+    # Preferred extensions
+    {
+        "command": "python3 project.py -p SE-PR -f test_af1.apx",
+        "expected_output": "[['A', 'D'], ['B', 'D']]"
+    },
+    {
+        "command": "python3 project.py -p SE-PR -f test_af2.apx",
+        "expected_output": "[['A', 'D'], ['A', 'E'], ['B', 'D'], ['B', 'E']]"
+    },
+    {
+        "command": "python3 project.py -p SE-PR -f test_af3.apx",
+        "expected_output": "[['A', 'D'], ['A', 'E']]"
+    },
+    {
+        "command": "python3 project.py -p SE-PR -f test_af4.apx",
+        "expected_output": "[['A', 'D'], ['A', 'E'], ['B', 'D'], ['B', 'E'], ['C', 'E']]"
+    },
+    {
+        "command": "python3 project.py -p SE-PR -f test_af5.apx",
+        "expected_output": "[['A', 'C', 'F']]"
+    },
+    {
+        "command": "python3 project.py -p SE-PR -f test_af6.apx",
+        "expected_output": "[['A', 'C', 'E'], ['A', 'C', 'F']]"
+    },
+
+    # Credulously accepted arguments for the preferred extensions
+    {
+        "command": "python3 project.py -p DC-PR -f test_af3.apx -a A",
+        "expected_output": "YES"
+    },
+    {
+        "command": "python3 project.py -p DC-PR -f test_af3.apx -a B",
+        "expected_output": "NO"
+    },
+    {
+        "command": "python3 project.py -p DC-PR -f test_af3.apx -a C",
+        "expected_output": "NO"
+    },
+    {
+        "command": "python3 project.py -p DC-PR -f test_af3.apx -a D",
+        "expected_output": "YES"
+    },
+    {
+        "command": "python3 project.py -p DC-PR -f test_af3.apx -a E",
+        "expected_output": "YES"
+    },
+    {
+        "command": "python3 project.py -p DC-PR -f test_af3.apx -a F",
+        "expected_output": "NO"
+    },
+
+    # Skeptically accepted arguments for the preferred extensions
+    {
+        "command": "python3 project.py -p DS-PR -f test_af3.apx -a A",
+        "expected_output": "YES"
+    },
+    {
+        "command": "python3 project.py -p DS-PR -f test_af3.apx -a B",
+        "expected_output": "NO"
+    },
+    {
+        "command": "python3 project.py -p DS-PR -f test_af3.apx -a C",
+        "expected_output": "NO"
+    },
+    {
+        "command": "python3 project.py -p DS-PR -f test_af3.apx -a D",
+        "expected_output": "NO"
+    },
+    {
+        "command": "python3 project.py -p DS-PR -f test_af3.apx -a E",
+        "expected_output": "NO"
+    },
+    {
+        "command": "python3 project.py -p DS-PR -f test_af3.apx -a F",
+        "expected_output": "NO"
+    },
+    {
+        "command": "python3 project.py -p DS-PR -f test_af6.apx -a A",
+        "expected_output": "YES"
+    },
+    {
+        "command": "python3 project.py -p DS-PR -f test_af6.apx -a B",
+        "expected_output": "NO"
+    },
+    {
+        "command": "python3 project.py -p DS-PR -f test_af6.apx -a C",
+        "expected_output": "YES"
+    },
+    {
+        "command": "python3 project.py -p DS-PR -f test_af6.apx -a D",
+        "expected_output": "NO"
+    },
+    {
+        "command": "python3 project.py -p DS-PR -f test_af6.apx -a E",
+        "expected_output": "NO"
+    },
+    {
+        "command": "python3 project.py -p DS-PR -f test_af6.apx -a F",
+        "expected_output": "NO"
+    },
+    {
+        "command": "python3 project.py -p DC-PR -f test_af6.apx -a A",
+        "expected_output": "YES"
+    },
+    {
+        "command": "python3 project.py -p DC-PR -f test_af6.apx -a B",
+        "expected_output": "NO"
+    },
+    {
+        "command": "python3 project.py -p DC-PR -f test_af6.apx -a C",
+        "expected_output": "YES"
+    },
+    {
+        "command": "python3 project.py -p DC-PR -f test_af6.apx -a D",
+        "expected_output": "NO"
+    },
+    {
+        "command": "python3 project.py -p DC-PR -f test_af6.apx -a E",
+        "expected_output": "YES"
+    },
+    {
+        "command": "python3 project.py -p DC-PR -f test_af6.apx -a F",
+        "expected_output": "YES"
+    },
+
+    # Number of extensions
+    {
+        "command": "python3 project.py -p CE-CO -f test_af1.apx",
+        "expected_output": "3"
+    },
+    {
+        "command": "python3 project.py -p CE-CO -f test_af2.apx",
+        "expected_output": "8"
+    },
+    {
+        "command": "python3 project.py -p CE-CO -f test_af3.apx",
+        "expected_output": "5"
+    },
+    {
+        "command": "python3 project.py -p CE-CO -f test_af4.apx",
+        "expected_output": "10"
+    },
+    {
+        "command": "python3 project.py -p CE-CO -f test_af5.apx",
+        "expected_output": "2"
+    },
+    {
+        "command": "python3 project.py -p CE-CO -f test_af6.apx",
+        "expected_output": "3"
+    },
+    {
+        "command": "python3 project.py -p CE-ST -f test_af1.apx",
+        "expected_output": "2"
+    },
+    {
+        "command": "python3 project.py -p CE-ST -f test_af2.apx",
+        "expected_output": "4"
+    },
+    {
+        "command": "python3 project.py -p CE-ST -f test_af3.apx",
+        "expected_output": "2"
+    },
+    {
+        "command": "python3 project.py -p CE-ST -f test_af4.apx",
+        "expected_output": "5"
+    },
+    {
+        "command": "python3 project.py -p CE-ST -f test_af5.apx",
+        "expected_output": "1"
+    },
+    {
+        "command": "python3 project.py -p CE-ST -f test_af6.apx",
+        "expected_output": "2"
+    },
+    {
+        "command": "python3 project.py -p CE-PR -f test_af4.apx",
+        "expected_output": "5"
+    },
+    {
+        "command": "python3 project.py -p CE-GR -f test_af6.apx",
+        "expected_output": "1"
+    },
+
+    # First extensions only
+    {
+        "command": "python3 project.py -p SE-CO -f test_af4.apx --limit 0",
+        "expected_output": "[]"
+    },
+    {
+        "command": "python3 project.py -p SE-ST -f test_af5.apx --limit 1",
+        "expected_output": "[['A', 'C', 'F']]"
+    },
+    {
+        "command": "python3 project.py -p SE-CO -f test_af6.apx --limit 10",
+        "expected_output": "[['A', 'C'], ['A', 'C', 'E'], ['A', 'C', 'F']]"
+    },
+    {
+        "command": "python3 project.py -p SE-CO -f test_af6.apx --limit -1",
+        "expected_output": ""
+    },
+
+    # Input formats: TGF, i23 (arguments numbered from 1), apx with comments, malformed apx
+    {
+        "command": "python3 project.py -p SE-CO -f test_af1.tgf",
+        "expected_output": "[[], ['A', 'D'], ['B', 'D']]"
+    },
+    {
+        "command": "python3 project.py -p SE-ST -f test_af1.tgf",
+        "expected_output": "[['A', 'D'], ['B', 'D']]"
+    },
+    {
+        "command": "python3 project.py -p SE-CO -f test_af1.i23",
+        "expected_output": "[[], ['1', '4'], ['2', '4']]"
+    },
+    {
+        "command": "python3 project.py -p DC-ST -f test_af1.i23 -a 4",
+        "expected_output": "YES"
+    },
+    {
+        "command": "python3 project.py -p SE-CO -f test_af_commentaires.apx",
+        "expected_output": "[[], ['A', 'D'], ['B', 'D']]"
+    },
+    {
+        "command": "python3 project.py -p SE-CO -f test_af_malforme.apx",
+        "expected_output": "",
+        "expected_error": "énoncés mal formés aux lignes 3, 5"
+    },
+    {
+        "command": "python3 project.py -p SE-CO -f test_af_non_declare.apx",
+        "expected_output": "",
+        "expected_error": "énoncés mal formés aux lignes 4, 6"
+    },
+    {
+        "command": "python3 project.py -p SE-CO -f test_af_non_declare.tgf",
+        "expected_output": "",
+        "expected_error": "énoncés mal formés aux lignes 5"
+    },
+    {
+        "command": "python3 project.py -p SE-CO -f test_af_non_declare.i23",
+        "expected_output": "",
+        "expected_error": "énoncés mal formés aux lignes 3"
+    },
+    {
+        "command": "python3 project.py -p SE-CO -f test_af1.afb",
+        "expected_output": "[[], ['A', 'D'], ['B', 'D']]"
+    },
+    {
+        "command": "python3 project.py -p CE-ST -f test_af1.afb",
+        "expected_output": "2"
+    },
+    {
+        "command": "python3 project.py -p SE-CO -f test_af_tronque.afb",
+        "expected_output": "",
+        "expected_error": "fichier binaire tronqué"
+    },
+    {
+        "command": "python3 project.py -p SE-CO -f test_af_cible_corrompue.afb",
+        "expected_output": "",
+        "expected_error": "fichier binaire corrompu"
+    },
+    {
+        "command": "python3 project.py -p SE-CO -f test_af_debuts_corrompus.afb",
+        "expected_output": "",
+        "expected_error": "fichier binaire corrompu"
+    },
+    {
+        "command": "python3 project.py -p SE-CO -f test_af_absent.apx",
+        "expected_output": "",
+        "expected_error": "Fichier illisible"
+    },
+
+    # SAT engine, checked against the same expectations as the labelling search
+    {
+        "command": "python3 project.py -p SE-CO -f test_af1.apx --engine sat",
+        "expected_output": "[[], ['A', 'D'], ['B', 'D']]"
+    },
+    {
+        "command": "python3 project.py -p SE-ST -f test_af1.apx --engine sat",
+        "expected_output": "[['A', 'D'], ['B', 'D']]"
+    },
+    {
+        "command": "python3 project.py -p CE-CO -f test_af1.apx --engine sat",
+        "expected_output": "3"
+    },
+    {
+        "command": "python3 project.py -p CE-ST -f test_af1.apx --engine sat",
+        "expected_output": "2"
+    },
+    {
+        "command": "python3 project.py -p SE-CO -f test_af2.apx --engine sat",
+        "expected_output": "[[], ['A'], ['A', 'D'], ['A', 'E'], ['B'], ['B', 'D'], ['B', 'E'], ['E']]"
+    },
+    {
+        "command": "python3 project.py -p SE-ST -f test_af2.apx --engine sat",
+        "expected_output": "[['A', 'D'], ['A', 'E'], ['B', 'D'], ['B', 'E']]"
+    },
+    {
+        "command": "python3 project.py -p CE-CO -f test_af2.apx --engine sat",
+        "expected_output": "8"
+    },
+    {
+        "command": "python3 project.py -p CE-ST -f test_af2.apx --engine sat",
+        "expected_output": "4"
+    },
+    {
+        "command": "python3 project.py -p SE-CO -f test_af3.apx --engine sat",
+        "expected_output": "[[], ['A'], ['A', 'D'], ['A', 'E'], ['E']]"
+    },
+    {
+        "command": "python3 project.py -p SE-ST -f test_af3.apx --engine sat",
+        "expected_output": "[['A', 'D'], ['A', 'E']]"
+    },
+    {
+        "command": "python3 project.py -p CE-CO -f test_af3.apx --engine sat",
+        "expected_output": "5"
+    },
+    {
+        "command": "python3 project.py -p CE-ST -f test_af3.apx --engine sat",
+        "expected_output": "2"
+    },
+    {
+        "command": "python3 project.py -p SE-CO -f test_af4.apx --engine sat",
+        "expected_output": "[[], ['A'], ['A', 'D'], ['A', 'E'], ['B'], ['B', 'D'], ['B', 'E'], ['C', 'E'], ['D'], ['E']]"
+    },
+    {
+        "command": "python3 project.py -p SE-ST -f test_af4.apx --engine sat",
+        "expected_output": "[['A', 'D'], ['A', 'E'], ['B', 'D'], ['B', 'E'], ['C', 'E']]"
+    },
+    {
+        "command": "python3 project.py -p CE-CO -f test_af4.apx --engine sat",
+        "expected_output": "10"
+    },
+    {
+        "command": "python3 project.py -p CE-ST -f test_af4.apx --engine sat",
+        "expected_output": "5"
+    },
+    {
+        "command": "python3 project.py -p SE-CO -f test_af5.apx --engine sat",
+        "expected_output": "[[], ['A', 'C', 'F']]"
+    },
+    {
+        "command": "python3 project.py -p SE-ST -f test_af5.apx --engine sat",
+        "expected_output": "[['A', 'C', 'F']]"
+    },
+    {
+        "command": "python3 project.py -p CE-CO -f test_af5.apx --engine sat",
+        "expected_output": "2"
+    },
+    {
+        "command": "python3 project.py -p CE-ST -f test_af5.apx --engine sat",
+        "expected_output": "1"
+    },
+    {
+        "command": "python3 project.py -p SE-CO -f test_af6.apx --engine sat",
+        "expected_output": "[['A', 'C'], ['A', 'C', 'E'], ['A', 'C', 'F']]"
+    },
+    {
+        "command": "python3 project.py -p SE-ST -f test_af6.apx --engine sat",
+        "expected_output": "[['A', 'C', 'E'], ['A', 'C', 'F']]"
+    },
+    {
+        "command": "python3 project.py -p CE-CO -f test_af6.apx --engine sat",
+        "expected_output": "3"
+    },
+    {
+        "command": "python3 project.py -p CE-ST -f test_af6.apx --engine sat",
+        "expected_output": "2"
+    },
+
+    # Parallel enumeration on two worker processes
+    {
+        "command": "python3 project.py -p SE-CO -f test_af1.apx --jobs 2",
+        "expected_output": "[[], ['A', 'D'], ['B', 'D']]"
+    },
+    {
+        "command": "python3 project.py -p SE-ST -f test_af1.apx --jobs 2",
+        "expected_output": "[['A', 'D'], ['B', 'D']]"
+    },
+    {
+        "command": "python3 project.py -p SE-CO -f test_af2.apx --jobs 2",
+        "expected_output": "[[], ['A'], ['A', 'D'], ['A', 'E'], ['B'], ['B', 'D'], ['B', 'E'], ['E']]"
+    },
+    {
+        "command": "python3 project.py -p SE-ST -f test_af2.apx --jobs 2",
+        "expected_output": "[['A', 'D'], ['A', 'E'], ['B', 'D'], ['B', 'E']]"
+    },
+    {
+        "command": "python3 project.py -p SE-CO -f test_af3.apx --jobs 2",
+        "expected_output": "[[], ['A'], ['A', 'D'], ['A', 'E'], ['E']]"
+    },
+    {
+        "command": "python3 project.py -p SE-ST -f test_af3.apx --jobs 2",
+        "expected_output": "[['A', 'D'], ['A', 'E']]"
+    },
+    {
+        "command": "python3 project.py -p SE-CO -f test_af4.apx --jobs 2",
+        "expected_output": "[[], ['A'], ['A', 'D'], ['A', 'E'], ['B'], ['B', 'D'], ['B', 'E'], ['C', 'E'], ['D'], ['E']]"
+    },
+    {
+        "command": "python3 project.py -p SE-ST -f test_af4.apx --jobs 2",
+        "expected_output": "[['A', 'D'], ['A', 'E'], ['B', 'D'], ['B', 'E'], ['C', 'E']]"
+    },
+    {
+        "command": "python3 project.py -p SE-CO -f test_af5.apx --jobs 2",
+        "expected_output": "[[], ['A', 'C', 'F']]"
+    },
+    {
+        "command": "python3 project.py -p SE-ST -f test_af5.apx --jobs 2",
+        "expected_output": "[['A', 'C', 'F']]"
+    },
+    {
+        "command": "python3 project.py -p SE-CO -f test_af6.apx --jobs 2",
+        "expected_output": "[['A', 'C'], ['A', 'C', 'E'], ['A', 'C', 'F']]"
+    },
+    {
+        "command": "python3 project.py -p SE-ST -f test_af6.apx --jobs 2",
+        "expected_output": "[['A', 'C', 'E'], ['A', 'C', 'F']]"
+    },
+
+    # Disk cache in a fresh temporary directory: hits and misses, extensions read back from the cache
+    # (same framework in another format), LRU eviction under --cache-size
+    {
+        "command": "python3 project.py --batch test_lot_cache.txt --cache {tmp} --cache-stats",
+        "expected_output": "[[], ['A', 'D'], ['B', 'D']]\n[[], ['A', 'D'], ['B', 'D']]\n"
+                           "[['A', 'D'], ['B', 'D']]\n[['A', 'D'], ['B', 'D']]",
+        "expected_error": "{'hits': 2, 'misses': 2, 'entrees': 2, 'octets': 13}"
+    },
+    {
+        "command": "python3 project.py --batch test_lot_cache_lru.txt --cache {tmp} --cache-stats --cache-size 0.00002",
+        "expected_output": "[[], ['A', 'D'], ['B', 'D']]\n[['A', 'D'], ['B', 'D']]\n[[], ['A', 'D'], ['B', 'D']]\n"
+                           "[[], ['A'], ['A', 'D'], ['A', 'E'], ['E']]\n[['A', 'D'], ['B', 'D']]",
+        "expected_error": "{'hits': 1, 'misses': 4, 'entrees': 2, 'octets': 15}"
+    },
+
+    # Batch: a bad line gets an error line, the remaining queries are answered
+    {
+        "command": "python3 project.py --batch test_lot_erreurs.txt",
+        "expected_output": "[[], ['A', 'D'], ['B', 'D']]\nRequête invalide: --bogus\n"
+                           "Fichier illisible: test_af_malforme.apx: énoncés mal formés aux lignes 3, 5\n"
+                           "Requête invalide: -p SE-CO -f \"test_af1.apx\n3\nYES",
+        "expected_error": "unrecognized arguments: --bogus"
+    },
+
+    # Thin client without a daemon
+    {
+        "command": "python3 project.py --connect /nonexistent/argumentation.sock -p SE-CO -f test_af1.apx",
+        "expected_output": "",
+        "expected_error": "Connexion impossible"
+    },
+
+    # Time and memory budgets
+    {
+        "command": "python3 project.py -p SE-CO -f test_af3.apx --timeout 60 --max-memory 4096",
+        "expected_output": "[[], ['A'], ['A', 'D'], ['A', 'E'], ['E']]"
+    },
+    {
+        "command": "python3 project.py -p CE-ST -f test_af4.apx --timeout 60",
+        "expected_output": "5"
+    },
+    {
+        "command": "python3 project.py -p CE-CO -f test_af3.apx --timeout 0",
+        "expected_output": "0\nINCOMPLETE"
+    },
+    {
+        "command": "python3 project.py -p SE-CO -f test_af3.apx --timeout 0",
+        "expected_output": "[]\nINCOMPLETE"
+    },
+
+    # Timeout during the search: the extensions found so far are printed before the marker, also
+    # when they go through the batch memo or the disk cache
+    {
+        "command": "python3 project.py -p SE-ST -f test_af_paires.apx --timeout 0.5",
+        "expected_output": "INCOMPLETE",
+        "expected_error": "délai dépassé",
+        "partial": True
+    },
+    {
+        "command": "python3 project.py --batch test_lot_paires.txt --timeout 0.5",
+        "expected_output": "INCOMPLETE",
+        "expected_error": "délai dépassé",
+        "partial": True
+    },
+    {
+        "command": "python3 project.py -p SE-ST -f test_af_paires.apx --timeout 0.5 --cache {tmp}",
+        "expected_output": "INCOMPLETE",
+        "expected_error": "délai dépassé",
+        "partial": True
+    },
+
+    # Profiling output goes to stderr, stdout is unchanged
+    {
+        "command": "python3 project.py -p SE-CO -f test_af3.apx --profile",
+        "expected_output": "[[], ['A'], ['A', 'D'], ['A', 'E'], ['E']]"
+    },
+    {
+        "command": "python3 project.py -p DC-ST -f test_af4.apx -a A --engine naif --profile",
+        "expected_output": "YES"
     }
 ]
 
 
+# NumPy engine: numpy is an optional dependency. With numpy the engine is checked against the same
+# expectations as the others, without it the CLI must refuse it with a clear error.
+if importlib.util.find_spec("numpy") is not None:
+    tests += [
+        {
+            "command": "python3 project.py -p SE-CO -f test_af1.apx --engine numpy",
+            "expected_output": "[[], ['A', 'D'], ['B', 'D']]"
+        },
+        {
+            "command": "python3 project.py -p SE-ST -f test_af1.apx --engine numpy",
+            "expected_output": "[['A', 'D'], ['B', 'D']]"
+        },
+        {
+            "command": "python3 project.py -p CE-CO -f test_af1.apx --engine numpy",
+            "expected_output": "3"
+        },
+        {
+            "command": "python3 project.py -p SE-CO -f test_af2.apx --engine numpy",
+            "expected_output": "[[], ['A'], ['A', 'D'], ['A', 'E'], ['B'], ['B', 'D'], ['B', 'E'], ['E']]"
+        },
+        {
+            "command": "python3 project.py -p SE-ST -f test_af2.apx --engine numpy",
+            "expected_output": "[['A', 'D'], ['A', 'E'], ['B', 'D'], ['B', 'E']]"
+        },
+        {
+            "command": "python3 project.py -p CE-CO -f test_af2.apx --engine numpy",
+            "expected_output": "8"
+        },
+        {
+            "command": "python3 project.py -p SE-CO -f test_af3.apx --engine numpy",
+            "expected_output": "[[], ['A'], ['A', 'D'], ['A', 'E'], ['E']]"
+        },
+        {
+            "command": "python3 project.py -p SE-ST -f test_af3.apx --engine numpy",
+            "expected_output": "[['A', 'D'], ['A', 'E']]"
+        },
+        {
+            "command": "python3 project.py -p CE-CO -f test_af3.apx --engine numpy",
+            "expected_output": "5"
+        },
+        {
+            "command": "python3 project.py -p SE-CO -f test_af4.apx --engine numpy",
+            "expected_output": "[[], ['A'], ['A', 'D'], ['A', 'E'], ['B'], ['B', 'D'], ['B', 'E'], ['C', 'E'], ['D'], ['E']]"
+        },
+        {
+            "command": "python3 project.py -p SE-ST -f test_af4.apx --engine numpy",
+            "expected_output": "[['A', 'D'], ['A', 'E'], ['B', 'D'], ['B', 'E'], ['C', 'E']]"
+        },
+        {
+            "command": "python3 project.py -p CE-CO -f test_af4.apx --engine numpy",
+            "expected_output": "10"
+        },
+        {
+            "command": "python3 project.py -p SE-CO -f test_af5.apx --engine numpy",
+            "expected_output": "[[], ['A', 'C', 'F']]"
+        },
+        {
+            "command": "python3 project.py -p SE-ST -f test_af5.apx --engine numpy",
+            "expected_output": "[['A', 'C', 'F']]"
+        },
+        {
+            "command": "python3 project.py -p CE-CO -f test_af5.apx --engine numpy",
+            "expected_output": "2"
+        },
+        {
+            "command": "python3 project.py -p SE-CO -f test_af6.apx --engine numpy",
+            "expected_output": "[['A', 'C'], ['A', 'C', 'E'], ['A', 'C', 'F']]"
+        },
+        {
+            "command": "python3 project.py -p SE-ST -f test_af6.apx --engine numpy",
+            "expected_output": "[['A', 'C', 'E'], ['A', 'C', 'F']]"
+        },
+        {
+            "command": "python3 project.py -p CE-CO -f test_af6.apx --engine numpy",
+            "expected_output": "3"
+        },
+        {
+            "command": "python3 project.py -p DS-CO -f test_af3.apx -a A --engine numpy",
+            "expected_output": "NO"
+        },
+        {
+            "command": "python3 project.py -p DS-CO -f test_af3.apx -a D --engine numpy",
+            "expected_output": "NO"
+        }
+    ]
+else:
+    tests.append({
+        "command": "python3 project.py -p SE-CO -f test_af1.apx --engine numpy",
+        "expected_output": "",
+        "expected_error": "le moteur numpy nécessite le paquet numpy"
+    })
+
+
 
 def parse_and_sort_sets(output):
     """
-    Parse les ensembles dans une sortie, les trie individuellement et globalement.
+    Parse les ensembles de chaque ligne de la forme [...] d'une sortie (une par requête d'un lot),
+    les trie individuellement. Retourne None si la sortie ne contient aucune ligne de ce genre.
     """
     lines = output.strip().split("\n")
-    parsed_sets = []
+    all_sets = []
     for line in lines:
         if line.startswith("[") and line.endswith("]"):
             try:
                 parsed_sets = eval(line)  # Interprète la ligne contenant les ensembles comme une liste Python
-                break
             except:
                 continue
-    if isinstance(parsed_sets, list):
-        return [sorted(ext) for ext in parsed_sets]
-    return parsed_sets
+            if isinstance(parsed_sets, list):
+                all_sets.append([sorted(ext) for ext in parsed_sets])
+    return all_sets or None
+
+def other_lines(output):
+    """
+    Les lignes d'une sortie qui ne sont pas une liste d'ensembles (par exemple le marqueur INCOMPLETE).
+    """
+    return [line.strip() for line in output.strip().split("\n") if not line.startswith("[")]
 
 def compare_outputs_unordered(expected, actual):
     """
     Compare expected and actual outputs by ensuring each actual set matches an expected set, ignoring order.
+    The other lines (YES/NO, counts, INCOMPLETE marker) must match exactly.
+
+    Écart voulu avec la version d'origine: quand aucune des deux sorties ne contenait de ligne [...],
+    parse_and_sort_sets renvoyait [] des deux côtés et la comparaison réussissait toujours, si bien que
+    les cas YES/NO, les nombres et les attendus "accepted arguments:" (que project.py n'a jamais
+    affichés) passaient quelle que soit la sortie. Ces sorties sont maintenant comparées exactement.
+    Seul l'ordre des extensions et de leurs arguments reste libre, comme avant.
     """
     expected_sets = parse_and_sort_sets(expected)
     actual_sets = parse_and_sort_sets(actual)
 
-    if not isinstance(expected_sets, list) or not isinstance(actual_sets, list):
+    if expected_sets is None or actual_sets is None:
         return expected.strip() == actual.strip()
 
-    # Convert lists of lists into sets of tuples pour comparaison
-    expected_sets = {tuple(sorted(ext)) for ext in expected_sets}
-    actual_sets = {tuple(sorted(ext)) for ext in actual_sets}
+    # Convert lists of lists into sets of tuples pour comparaison, ligne par ligne
+    expected_sets = [{tuple(ext) for ext in sets} for sets in expected_sets]
+    actual_sets = [{tuple(ext) for ext in sets} for sets in actual_sets]
+
+    return expected_sets == actual_sets and other_lines(expected) == other_lines(actual)
 
-    return expected_sets == actual_sets
+def run_command(command):
+    """
+    Exécute une commande "python3 project.py ..." dans le processus courant et renvoie ses sorties
+    standard et d'erreur. {tmp} dans la commande est remplacé par un dossier temporaire vide, propre
+    à cette exécution (par exemple pour --cache).
+    """
+    stdout, stderr = io.StringIO(), io.StringIO()
+    with tempfile.TemporaryDirectory() as dossier, redirect_stdout(stdout), redirect_stderr(stderr):
+        argv = shlex.split(command.replace("{tmp}", dossier))[2:]
+        try:
+            project.main(argv)
+        except SystemExit:
+            # Codes de sortie non nuls (résultat incomplet, erreur d'arguments): seule la sortie compte
+            pass
+    return stdout.getvalue().strip(), stderr.getvalue().strip()
 
-def run_test(test):
+def run_test(test, actual_output, actual_error=""):
     """
-    Exécute un test, compare la sortie réelle avec la sortie attendue et retourne le résultat.
+    Compare la sortie réelle d'un test avec la sortie attendue et retourne le résultat.
+    Si le test a un champ expected_error, ce texte doit aussi apparaître sur la sortie d'erreur.
     """
-    command = test["command"]
     expected_output = test["expected_output"]
+    expected_error = test.get("expected_error")
+    if expected_error is not None and expected_error not in actual_error:
+        return False, f"Expected error: {expected_error}\nActual error: {actual_error}"
 
-    try:
-        result = subprocess.run(command, shell=True, text=True, capture_output=True)
-        actual_output = result.stdout.strip()
+    # Résultat partiel (budget dépassé en cours de recherche): les extensions trouvées dépendent de la
+    # vitesse de la machine, on vérifie seulement qu'il y en a et que les autres lignes correspondent
+    if test.get("partial"):
+        actual_sets = parse_and_sort_sets(actual_output)
+        if actual_sets and actual_sets[0] and other_lines(expected_output) == other_lines(actual_output):
+            return True, f"{len(actual_sets[0])} extensions, then {other_lines(actual_output)}"
+        return False, f"Expected a non-empty partial result, then: {expected_output}\nActual: {actual_output[-200:]}"
 
-        # Compare les résultats
-        if compare_outputs_unordered(expected_output, actual_output):
-            return True, actual_output
-        else:
-            return False, f"Expected: {expected_output}\nActual: {actual_output}"
-    except Exception as e:
-        return False, str(e)
-
-# Exécution des tests
-total_tests = len(tests)
-passed_tests = 0
-failed_tests = []
-
-for test in tests:
-    success, output = run_test(test)
-    if success:
-        passed_tests += 1
-        print(f"✔ Test Passed: {test['command']} \n  Output: {output}")
+    # Compare les résultats
+    if compare_outputs_unordered(expected_output, actual_output):
+        return True, actual_output
     else:
-        failed_tests.append({"command": test["command"], "error": output})
-        print(f"✘ Test Failed: {test['command']} \n  Error: {output}")
-
-# Résumé des résultats
-print("\nTest Summary:")
-print(f"Total Tests: {total_tests}")
-print(f"Passed: {passed_tests}")
-print(f"Failed: {len(failed_tests)}")
-
-if failed_tests:
-    print("\nFailed Tests Details:")
-    for fail in failed_tests:
-        print(f"Command: {fail['command']}")
-        print(f"Error: {fail['error']}")
-        print("----------------------------------------")
\ No newline at end of file
+        return False, f"Expected: {expected_output}\nActual: {actual_output}"
+
+def run_commands(commands):
+    """
+    Exécute chaque commande distincte une seule fois, en parallèle sur un groupe de processus.
+    Renvoie la sortie de chaque commande, ou l'exception levée.
+    """
+    distinct = list(dict.fromkeys(commands))
+    outputs = {}
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        futures = {command: executor.submit(run_command, command) for command in distinct}
+        for command, future in futures.items():
+            try:
+                outputs[command] = future.result()
+            except Exception as e:
+                outputs[command] = e
+    return outputs
+
+def check_comparator():
+    """
+    Le comparateur doit distinguer les réponses (voir compare_outputs_unordered): un comparateur qui
+    accepte tout ferait passer tous les tests.
+    """
+    assert not compare_outputs_unordered("YES", "NO")
+    assert not compare_outputs_unordered("3", "2")
+    assert not compare_outputs_unordered("[['A']]\nINCOMPLETE", "[['A']]")
+    assert not compare_outputs_unordered("[['A'], ['B']]", "[['A']]")
+    assert compare_outputs_unordered("[['B', 'A'], []]", "[[], ['A', 'B']]")
+
+if __name__ == "__main__":
+    check_comparator()
+
+    # Exécution des tests
+    total_tests = len(tests)
+    passed_tests = 0
+    failed_tests = []
+
+    outputs = run_commands([test["command"] for test in tests])
+    for test in tests:
+        output = outputs[test["command"]]
+        if isinstance(output, Exception):
+            success, output = False, str(output)
+        else:
+            success, output = run_test(test, *output)
+        if success:
+            passed_tests += 1
+            print(f"✔ Test Passed: {test['command']} \n  Output: {output}")
+        else:
+            failed_tests.append({"command": test["command"], "error": output})
+            print(f"✘ Test Failed: {test['command']} \n  Error: {output}")
+
+    # Résumé des résultats
+    print("\nTest Summary:")
+    print(f"Total Tests: {total_tests}")
+    print(f"Passed: {passed_tests}")
+    print(f"Failed: {len(failed_tests)}")
+
+    if failed_tests:
+        print("\nFailed Tests Details:")
+        for fail in failed_tests:
+            print(f"Command: {fail['command']}")
+            print(f"Error: {fail['error']}")
+            print("----------------------------------------")
@@ -0,0 +1,70 @@
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+#Moteur vectoriel optionnel (NumPy): les attaques sont rangées dans une matrice d'adjacence booléenne
+#A (A[i, j] vrai si i attaque j) et un lot de sous ensembles candidats est une matrice S dont chaque
+#ligne est un sous ensemble. Les vérifications deviennent des produits de matrices:
+# - S @ A compte, pour chaque argument, ses attaquants dans le sous ensemble
+# - (non attaqués par S) @ A compte les attaquants qui ne sont pas contre attaqués: F(S) = ceux à 0
+#Les résultats sont identiques au parcours naïf de Argumentation, seul le coût Python change.
+#Ce module n'est importé que par le moteur numpy (voir Argumentation._masques): NumPy n'est pas chargé
+#par les autres moteurs.
+
+#Taille des lots de sous ensembles évalués d'un coup
+TAILLE_LOT = 4096
+
+
+class MatriceAttaques:
+    def __init__(self, af):
+        if np is None:
+            raise ImportError("Le moteur numpy nécessite le paquet numpy (pip install numpy)")
+        self.af = af
+        n = len(af.etiquettes)
+        self.matrice = np.zeros((n, n), dtype=np.float32)
+        for j, masque in enumerate(af.masque_attaquants):
+            for i in range(n):
+                if masque >> i & 1:
+                    self.matrice[i, j] = 1
+
+    #Les arguments attaqués par chaque sous ensemble du lot
+    def attaques(self, lot):
+        return lot.astype(np.float32) @ self.matrice > 0
+
+    def sans_conflit(self, lot, attaques=None):
+        if attaques is None:
+            attaques = self.attaques(lot)
+        return ~(lot & attaques).any(axis=1)
+
+    #La fonction caractéristique F(S) pour chaque sous ensemble du lot: les arguments dont tous les
+    #attaquants sont attaqués par S
+    def defendus(self, lot, attaques=None):
+        if attaques is None:
+            attaques = self.attaques(lot)
+        return (~attaques).astype(np.float32) @ self.matrice == 0
+
+    def completes(self, lot):
+        attaques = self.attaques(lot)
+        return self.sans_conflit(lot, attaques) & (lot == self.defendus(lot, attaques)).all(axis=1)
+
+    def stables(self, lot):
+        attaques = self.attaques(lot)
+        return self.sans_conflit(lot, attaques) & (lot | attaques).all(axis=1)
+
+    #Parcourt tous les sous ensembles par lots de TAILLE_LOT: le sous ensemble numéro k est le masque k.
+    #Produit les masques des extensions ("CO" ou "ST") trouvées.
+    def iter_masques(self, semantique, budget=None):
+        n = len(self.af.etiquettes)
+        if n > 62:
+            raise ValueError("Le moteur numpy parcourt 2^n sous ensembles, n doit rester petit")
+        verification = self.completes if semantique == "CO" else self.stables
+        colonnes = np.arange(n, dtype=np.int64)
+        for debut in range(0, 1 << n, TAILLE_LOT):
+            #Un lot est déjà un gros morceau de calcul: le budget est vérifié à chaque lot
+            if budget is not None:
+                budget.verifier_maintenant()
+            masques = np.arange(debut, min(debut + TAILLE_LOT, 1 << n), dtype=np.int64)
+            lot = (masques[:, None] >> colonnes & 1).astype(bool)
+            for masque in masques[verification(lot)]:
+                yield int(masque)